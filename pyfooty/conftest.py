@@ -0,0 +1,2 @@
+# Kept at the package root so pytest puts it on sys.path, as the modules
+# import each other by top level name
@@ -0,0 +1,318 @@
+import asyncio
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Optional, Self
+
+import pandas as pd
+from sqlalchemy import Column, ColumnElement, Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database.engine import AsyncSessionFactory, SessionFactory
+from database.identity_map import IdentityMap
+from database.repository import (
+    REFERENCE_NATURAL_KEYS,
+    FootballRepository,
+    LoaderOptions,
+    _fixture_filters,
+    _keyset_page,
+    _loader_options,
+    _partition_key,
+    _supports_server_side_cursors,
+)
+from database.schemas import (
+    BaseModel,
+    FixtureModel,
+    PlayerInstanceModel,
+)
+from database.unit_of_work import UnitOfWork
+from entities.competition import Competition
+from entities.entity import Entity
+from entities.season import Season
+from entities.team import Team
+from global_utils import constants
+
+
+def _bound_session_factory(session: Session) -> SessionFactory:
+    @contextmanager
+    def session_factory() -> Iterator[Session]:
+        yield session
+
+    return session_factory
+
+
+async def _read_partitions(
+    session: AsyncSession,
+    stmt: Select,
+    primary_key: Sequence[Column],
+    chunk_size: int,
+    *,
+    scalars: bool = False,
+) -> AsyncIterator[Sequence[Any]]:
+    if _supports_server_side_cursors(session.sync_session):
+        result = await session.stream(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for partition in (
+            result.scalars() if scalars else result
+        ).partitions():
+            yield partition
+        return
+    last_key = None
+    while True:
+        result = await session.execute(
+            _keyset_page(stmt, primary_key, last_key, chunk_size)
+        )
+        partition = (result.scalars() if scalars else result).all()
+        if partition:
+            yield partition
+        if len(partition) < chunk_size:
+            return
+        last_key = _partition_key(partition, primary_key, scalars)
+
+
+class AsyncFootballRepository:
+    def __init__(
+        self,
+        session_factory: AsyncSessionFactory,
+        identity_map: Optional[IdentityMap] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.identity_map = (
+            identity_map
+            if identity_map is not None
+            else IdentityMap(REFERENCE_NATURAL_KEYS)
+        )
+        self._session: Optional[AsyncSession] = None
+        self._unit_of_work: Optional[UnitOfWork] = None
+        # An AsyncSession cannot run operations concurrently, so calls on a
+        # unit of work's shared session take turns
+        self._session_lock = asyncio.Lock()
+
+    def _call(
+        self, session: Session, method_name: str, args: tuple, kwargs: dict
+    ) -> Any:
+        # A repository per call, as every call runs on the event loop's
+        # thread and so would otherwise share its thread local state
+        repository = FootballRepository(
+            _bound_session_factory(session), self.identity_map
+        )
+        method = getattr(repository, method_name)
+        if self._unit_of_work is None:
+            return method(*args, **kwargs)
+        with repository.join_unit_of_work(self._unit_of_work):
+            return method(*args, **kwargs)
+
+    async def _run(self, method_name: str, *args, **kwargs) -> Any:
+        # The synchronous repository runs unchanged on the sync session
+        # behind the AsyncSession, with its IO awaited on the event loop
+        if self._session is not None:
+            async with self._session_lock:
+                return await self._session.run_sync(
+                    self._call, method_name, args, kwargs
+                )
+        async with self.session_factory() as session:
+            return await session.run_sync(
+                self._call, method_name, args, kwargs
+            )
+
+    @asynccontextmanager
+    async def unit_of_work(
+        self, flush_batch_size: int = constants.DB_FLUSH_BATCH_SIZE
+    ) -> AsyncIterator[Self]:
+        async with self.session_factory() as session:
+            repository = self.__class__(self.session_factory, self.identity_map)
+            repository._session = session
+            repository._unit_of_work = UnitOfWork(
+                session.sync_session,
+                flush_batch_size,
+                IdentityMap(self.identity_map.natural_keys),
+            )
+            yield repository
+            async with repository._session_lock:
+                await session.run_sync(
+                    lambda _: repository._unit_of_work.flush()
+                )
+                await session.commit()
+            self.identity_map.merge(repository._unit_of_work.identity_map)
+
+    def invalidate_cache(
+        self,
+        model_type: Optional[type[BaseModel]] = None,
+        key: Optional[tuple] = None,
+    ) -> None:
+        self.identity_map.invalidate(model_type, key)
+
+    async def add_many(
+        self, entities: Iterable[Entity], model_type: type[BaseModel]
+    ) -> None:
+        return await self._run('add_many', list(entities), model_type)
+
+    async def add_competition(self, competition: Competition) -> Competition:
+        return await self._run('add_competition', competition)
+
+    async def get_competition_by_name(self, name: str) -> Competition:
+        return await self._run('get_competition_by_name', name)
+
+    async def add_season(self, season: Season) -> Season:
+        return await self._run('add_season', season)
+
+    async def get_or_create_season(self, season: Season) -> Season:
+        return await self._run('get_or_create_season', season)
+
+    async def get_or_create_many(
+        self,
+        entities: Iterable[Entity],
+        model_type: type[BaseModel],
+        fields: Iterable[str],
+    ) -> list[Entity]:
+        return await self._run(
+            'get_or_create_many', list(entities), model_type, list(fields)
+        )
+
+    async def upsert_many(
+        self,
+        entities: Iterable[Entity],
+        model_type: type[BaseModel],
+        fields: Iterable[str],
+    ) -> list[Entity]:
+        return await self._run(
+            'upsert_many', list(entities), model_type, list(fields)
+        )
+
+    async def get_or_create_seasons(
+        self, seasons: Iterable[Season]
+    ) -> list[Season]:
+        return await self._run('get_or_create_seasons', list(seasons))
+
+    async def get_or_create_teams(self, teams: Iterable[Team]) -> list[Team]:
+        return await self._run('get_or_create_teams', list(teams))
+
+    async def update_team_logos(self, teams: Iterable[Team]) -> list[Team]:
+        return await self._run('update_team_logos', list(teams))
+
+    async def add_logos(self, blobs: Mapping[str, bytes]) -> dict[str, int]:
+        return await self._run('add_logos', blobs)
+
+    async def get_models(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        options: Optional[LoaderOptions] = None,
+    ) -> list[BaseModel]:
+        return await self._run(
+            'get_models', model_type, *where, options=options
+        )
+
+    async def get_entities(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        options: Optional[LoaderOptions] = None,
+    ) -> list[Entity]:
+        return await self._run(
+            'get_entities', model_type, *where, options=options
+        )
+
+    async def get_fixtures(
+        self,
+        *,
+        competition_id: Optional[int] = None,
+        season_id: Optional[int] = None,
+        options: Optional[LoaderOptions] = None,
+    ) -> list[FixtureModel]:
+        return await self._run(
+            'get_fixtures',
+            competition_id=competition_id,
+            season_id=season_id,
+            options=options,
+        )
+
+    @asynccontextmanager
+    async def _stream_session(self) -> AsyncIterator[AsyncSession]:
+        if self._session is None:
+            async with self.session_factory() as session:
+                yield session
+            return
+        # Held until the stream is closed, so other calls in the unit wait
+        # for it rather than being awaited from within the iteration
+        async with self._session_lock:
+            # Staged models must be visible to the streamed query
+            await self._session.run_sync(
+                lambda _: self._unit_of_work.flush()
+            )
+            yield self._session
+
+    async def stream_entities(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+        options: Optional[LoaderOptions] = None,
+    ) -> AsyncIterator[Entity]:
+        # Lazy loads cannot be awaited, so loader options are essential here
+        primary_key = list(model_type.__table__.primary_key)
+        stmt = (
+            select(model_type)
+            .where(*where)
+            .options(*_loader_options(model_type, options))
+            .order_by(*primary_key)
+        )
+        async with self._stream_session() as session:
+            async for models in _read_partitions(
+                session, stmt, primary_key, chunk_size, scalars=True
+            ):
+                entities = BaseModel.to_entities(models, validate=False)
+                # Stop the session holding on to every model streamed so far
+                for model in models:
+                    session.expunge(model)
+                for entity in entities:
+                    yield entity
+
+    async def stream_dataframes(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[pd.DataFrame]:
+        table = model_type.__table__
+        primary_key = list(table.primary_key)
+        stmt = select(table).where(*where).order_by(*primary_key)
+        columns = list(stmt.selected_columns.keys())
+        async with self._stream_session() as session:
+            async for rows in _read_partitions(
+                session, stmt, primary_key, chunk_size
+            ):
+                yield pd.DataFrame.from_records(rows, columns=columns)
+
+    def stream_fixtures(
+        self,
+        *,
+        competition_id: Optional[int] = None,
+        season_id: Optional[int] = None,
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[pd.DataFrame]:
+        return self.stream_dataframes(
+            FixtureModel,
+            *_fixture_filters(competition_id, season_id),
+            chunk_size=chunk_size,
+        )
+
+    def stream_player_appearances(
+        self,
+        *,
+        player_id: Optional[int] = None,
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[pd.DataFrame]:
+        where = []
+        if player_id is not None:
+            where.append(PlayerInstanceModel.player_id == player_id)
+        return self.stream_dataframes(
+            PlayerInstanceModel, *where, chunk_size=chunk_size
+        )
@@ -0,0 +1,65 @@
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Insert, Table, inspect, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from database.schemas import BaseModel
+
+
+def model_to_row(model: BaseModel) -> dict[str, Any]:
+    row = {
+        column_attr.key: getattr(model, column_attr.key)
+        for column_attr in inspect(model.__class__).column_attrs
+    }
+    # Let the database assign primary keys which have not been set
+    for column in model.__table__.primary_key:
+        if row.get(column.key) is None:
+            row.pop(column.key, None)
+    return row
+
+
+def _update_columns(table: Table, key_fields: Iterable[str]) -> list[str]:
+    excluded = set(key_fields) | {column.key for column in table.primary_key}
+    return [
+        column.key for column in table.columns if column.key not in excluded
+    ]
+
+
+def dialect_insert(
+    table: Table,
+    dialect_name: str,
+    key_fields: Iterable[str],
+    *,
+    update: bool = False,
+) -> Insert:
+    key_fields = list(key_fields)
+    update_columns = _update_columns(table, key_fields) if update else []
+
+    if dialect_name in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table)
+        if update_columns:
+            return stmt.on_duplicate_key_update(
+                {column: stmt.inserted[column] for column in update_columns}
+            )
+        # A no-op update, unlike INSERT IGNORE this does not hide errors
+        # other than duplicate keys
+        primary_key = next(iter(table.primary_key)).key
+        return stmt.on_duplicate_key_update(
+            {primary_key: table.c[primary_key]}
+        )
+
+    if dialect_name in ('postgresql', 'sqlite'):
+        dialect = postgresql if dialect_name == 'postgresql' else sqlite
+        stmt = dialect.insert(table)
+        if update_columns:
+            return stmt.on_conflict_do_update(
+                index_elements=key_fields,
+                set_={
+                    column: stmt.excluded[column] for column in update_columns
+                },
+            )
+        # No conflict target, so any unique constraint violation is skipped
+        return stmt.on_conflict_do_nothing()
+
+    return insert(table)
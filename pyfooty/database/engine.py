@@ -1,20 +1,140 @@
-from contextlib import AbstractContextManager, contextmanager
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    asynccontextmanager,
+    contextmanager,
+)
 from logging import getLogger
-from collections.abc import Iterator
-from typing import Callable
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Callable, Optional
 
-from sqlalchemy import URL, create_engine, Connection
+from attrs import field, frozen
+from sqlalchemy import URL, Engine, create_engine, Connection, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from global_utils import constants
 
 logger = getLogger(__name__)
 
 SessionFactory = Callable[..., AbstractContextManager[Session]]
 ConnectionFactory = Callable[..., AbstractContextManager[Connection]]
+AsyncSessionFactory = Callable[
+    ..., AbstractAsyncContextManager[AsyncSession]
+]
+AsyncConnectionFactory = Callable[
+    ..., AbstractAsyncContextManager[AsyncConnection]
+]
+
+
+def _to_url(url: URL | str) -> URL:
+    url = make_url(url)
+    # Credentials are kept out of the url so they never end up in config
+    if (
+        url.username is not None
+        and url.password is None
+        and constants.DATABASE_PASSWORD is not None
+    ):
+        url = url.set(password=constants.DATABASE_PASSWORD)
+    return url
+
+
+@frozen(kw_only=True)
+class DatabaseConfig:
+    url: URL = field(default=constants.DATABASE_URL, converter=_to_url)
+    pool_size: int = constants.DB_POOL_SIZE
+    max_overflow: int = constants.DB_MAX_OVERFLOW
+    pool_pre_ping: bool = constants.DB_POOL_PRE_PING
+    pool_recycle: int = constants.DB_POOL_RECYCLE
+    query_cache_size: int = constants.DB_QUERY_CACHE_SIZE
+    allow_local_infile: bool = constants.DB_ALLOW_LOCAL_INFILE
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.url.get_backend_name() == 'sqlite'
+
+    @property
+    def is_mysql(self) -> bool:
+        return self.url.get_backend_name() in ('mysql', 'mariadb')
+
+    @property
+    def is_in_memory(self) -> bool:
+        return self.is_sqlite and self.url.database in (None, '', ':memory:')
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {'query_cache_size': self.query_cache_size}
+        if self.is_in_memory:
+            # Every connection to an in-memory database gets its own empty
+            # database, so there is only ever one. Sessions queue for it and
+            # hold it until their transaction ends, so concurrent sessions
+            # run one transaction at a time rather than interleaving
+            kwargs.update(
+                poolclass=(
+                    AsyncAdaptedQueuePool
+                    if self.url.get_dialect().is_async
+                    else QueuePool
+                ),
+                pool_size=1,
+                max_overflow=0,
+                connect_args={'check_same_thread': False},
+            )
+            return kwargs
+        kwargs.update(
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            pool_recycle=self.pool_recycle,
+        )
+        if self.is_mysql and self.allow_local_infile:
+            # Needed for bulk loads through LOAD DATA LOCAL INFILE
+            kwargs['connect_args'] = {'allow_local_infile': True}
+        return kwargs
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def create_database_engine(config: DatabaseConfig) -> Engine:
+    engine = create_engine(config.url, **config.engine_kwargs())
+    if config.is_sqlite:
+        event.listen(engine, 'connect', _enable_sqlite_foreign_keys)
+    return engine
+
+
+def create_async_database_engine(config: DatabaseConfig) -> AsyncEngine:
+    engine = create_async_engine(config.url, **config.engine_kwargs())
+    if config.is_sqlite:
+        event.listen(
+            engine.sync_engine, 'connect', _enable_sqlite_foreign_keys
+        )
+    return engine
 
 
 class Database:
-    def __init__(self, url_object: URL) -> None:
-        self._engine = create_engine(url_object)
+    def __init__(
+        self,
+        url_object: Optional[URL | str] = None,
+        *,
+        config: Optional[DatabaseConfig] = None,
+    ) -> None:
+        if config is None:
+            config = (
+                DatabaseConfig(url=url_object)
+                if url_object is not None
+                else DatabaseConfig()
+            )
+        self.config = config
+        self._engine = create_database_engine(config)
         self._session_factory = scoped_session(
             sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
         )
@@ -42,3 +162,50 @@ class Database:
             raise
         finally:
             connection.close()
+
+
+class AsyncDatabase:
+    def __init__(
+        self,
+        url_object: Optional[URL | str] = None,
+        *,
+        config: Optional[DatabaseConfig] = None,
+    ) -> None:
+        if config is None:
+            config = (
+                DatabaseConfig(url=url_object)
+                if url_object is not None
+                else DatabaseConfig()
+            )
+        self.config = config
+        self._engine = create_async_database_engine(config)
+        self._session_factory = async_sessionmaker(
+            bind=self._engine, autoflush=False, expire_on_commit=False
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        session = self._session_factory()
+        try:
+            yield session
+        except Exception:
+            logger.exception('Session rollback because of exception')
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncConnection]:
+        connection = await self._engine.connect()
+        try:
+            yield connection
+        except Exception:
+            logger.exception('Connection rollback because of exception')
+            await connection.rollback()
+            raise
+        finally:
+            await connection.close()
+
+    async def dispose(self) -> None:
+        await self._engine.dispose()
@@ -0,0 +1,80 @@
+from collections.abc import Callable
+from functools import cache
+from typing import Any, Optional, TypeVar
+
+import attrs
+from sqlalchemy.orm import ColumnProperty, Composite
+
+from database.sqlalchemy_dict_mixin import get_fields_dict
+from entities.entity import Entity
+
+ModelType = TypeVar('ModelType', bound=type)
+
+_ENTITY_TYPES: dict[type, type[Entity]] = {}
+
+
+@attrs.frozen
+class EntityMapping:
+    model_type: type
+    entity_type: type[Entity]
+    # Pairs of attribute name and the matching entity __init__ argument
+    fields: tuple[tuple[str, str], ...]
+
+    def to_model(self, entity: Entity) -> Any:
+        return self.model_type(
+            **{name: getattr(entity, name) for name, _ in self.fields}
+        )
+
+    def to_entity(self, model: Any, *, validate: bool = True) -> Entity:
+        if validate:
+            return self.entity_type(
+                **{alias: getattr(model, name) for name, alias in self.fields}
+            )
+        # Rows from the database are trusted, so __init__ with its
+        # converters and validators is skipped entirely
+        entity = object.__new__(self.entity_type)
+        for name, _ in self.fields:
+            object.__setattr__(entity, name, getattr(model, name))
+        return entity
+
+
+def maps_to_entity(
+    entity_type: type[Entity],
+) -> Callable[[ModelType], ModelType]:
+    def decorator(model_type: ModelType) -> ModelType:
+        _ENTITY_TYPES[model_type] = entity_type
+        get_entity_mapping.cache_clear()
+        return model_type
+
+    return decorator
+
+
+def get_entity_type(model_type: type) -> Optional[type[Entity]]:
+    return _ENTITY_TYPES.get(model_type)
+
+
+@cache
+def get_entity_mapping(model_type: type) -> Optional[EntityMapping]:
+    # Compiled on first use, once the mappers can be inspected
+    entity_type = get_entity_type(model_type)
+    if entity_type is None:
+        return None
+    model_fields = {
+        name
+        for name, field in get_fields_dict(model_type).items()
+        if isinstance(field.property, (ColumnProperty, Composite))
+    }
+    entity_fields = attrs.fields(entity_type)
+    missing = [
+        field.name for field in entity_fields if field.name not in model_fields
+    ]
+    if missing:
+        raise ValueError(
+            f'Model: {model_type.__name__}, has no columns for fields: '
+            f'{", ".join(missing)}, of entity: {entity_type.__name__}.'
+        )
+    return EntityMapping(
+        model_type=model_type,
+        entity_type=entity_type,
+        fields=tuple((field.name, field.alias) for field in entity_fields),
+    )
@@ -1,3 +1,10 @@
 class CompetitionNotFoundError(Exception):
     def __init__(self, competition_name) -> None:
         super().__init__(f'Competition not found, name: {competition_name}')
+
+
+class SchemaVerificationError(Exception):
+    def __init__(self, missing: list[str]) -> None:
+        super().__init__(
+            'Database schema is missing: ' + ', '.join(missing) + '.'
+        )
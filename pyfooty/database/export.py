@@ -0,0 +1,148 @@
+from collections.abc import Iterator
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import shutil
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from sqlalchemy import Date, Enum, Integer, LargeBinary, String, Table
+
+from database.repository import FootballRepository
+from database.schemas import (
+    BaseModel,
+    CompetitionModel,
+    FixtureModel,
+    SeasonModel,
+    TeamModel,
+)
+from global_utils import constants
+
+# Partition columns for each exported model, reference tables are small
+# enough to be written unpartitioned
+EXPORTED_MODELS: dict[type[BaseModel], tuple[str, ...]] = {
+    CompetitionModel: (),
+    SeasonModel: (),
+    TeamModel: (),
+    FixtureModel: ('competition_id', 'season_id'),
+}
+
+_STATE_FILE_NAME = '_export_state.json'
+
+
+_ARROW_TYPES = (
+    (Integer, pa.int64()),
+    (Enum, pa.string()),
+    (String, pa.string()),
+    (Date, pa.date32()),
+    (LargeBinary, pa.binary()),
+)
+
+
+def _arrow_schema(table: Table) -> pa.Schema:
+    # Built from the table rather than inferred from the first chunk, which
+    # could have a column that is entirely null
+    fields = []
+    for column in table.columns:
+        arrow_type = next(
+            arrow_type
+            for sql_type, arrow_type in _ARROW_TYPES
+            if isinstance(column.type, sql_type)
+        )
+        fields.append(pa.field(column.name, arrow_type, column.nullable))
+    return pa.schema(fields)
+
+
+class ParquetExporter:
+    def __init__(
+        self,
+        repository: FootballRepository,
+        directory: Path | str,
+        *,
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> None:
+        self.repository = repository
+        self.directory = Path(directory)
+        self.chunk_size = chunk_size
+
+    @property
+    def _state_path(self) -> Path:
+        return self.directory / _STATE_FILE_NAME
+
+    def _load_state(self) -> dict[str, int]:
+        try:
+            with open(self._state_path, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: dict[str, int]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._state_path, 'w') as file:
+            json.dump(state, file, indent=2)
+
+    def export_model(
+        self,
+        model_type: type[BaseModel],
+        *,
+        after_id: Optional[int] = None,
+        basename: str = 'part',
+    ) -> Optional[int]:
+        table_name = model_type.__tablename__
+        where = [] if after_id is None else [model_type.id > after_id]
+        dataframes = self.repository.stream_dataframes(
+            model_type, *where, chunk_size=self.chunk_size
+        )
+        schema = _arrow_schema(model_type.__table__)
+        max_id = after_id
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            nonlocal max_id
+            for df in dataframes:
+                batch = pa.RecordBatch.from_pandas(
+                    df, schema=schema, preserve_index=False
+                )
+                batch_max_id = pc.max(batch.column('id')).as_py()
+                max_id = (
+                    batch_max_id
+                    if max_id is None
+                    else max(max_id, batch_max_id)
+                )
+                yield batch
+
+        partition_columns = EXPORTED_MODELS.get(model_type, ())
+        ds.write_dataset(
+            batches(),
+            self.directory / table_name,
+            schema=schema,
+            format='parquet',
+            partitioning=list(partition_columns) or None,
+            partitioning_flavor='hive' if partition_columns else None,
+            basename_template=f'{basename}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        return max_id
+
+    def export_all(self, *, incremental: bool = False) -> dict[str, int]:
+        state = self._load_state() if incremental else {}
+        # Deltas get a unique file name so they sit alongside earlier files
+        basename = (
+            'delta-' + datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+            if incremental
+            else 'part'
+        )
+        for model_type in EXPORTED_MODELS:
+            table_name = model_type.__tablename__
+            if not incremental:
+                shutil.rmtree(self.directory / table_name, ignore_errors=True)
+            max_id = self.export_model(
+                model_type,
+                after_id=state.get(table_name),
+                basename=basename,
+            )
+            if max_id is not None:
+                state[table_name] = max_id
+        self._save_state(state)
+        return state
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import threading
+from typing import Optional
+
+from database.schemas import BaseModel
+from entities.entity import Entity
+
+NaturalKey = tuple[str, ...]
+
+
+class IdentityMap:
+    def __init__(
+        self, natural_keys: Mapping[type[BaseModel], NaturalKey]
+    ) -> None:
+        self.natural_keys = dict(natural_keys)
+        self._entities: dict[type[BaseModel], dict[tuple, Entity]] = {
+            model_type: {} for model_type in self.natural_keys
+        }
+        self._lock = threading.Lock()
+
+    def is_natural_key(
+        self, model_type: type[BaseModel], fields: Iterable[str]
+    ) -> bool:
+        return self.natural_keys.get(model_type) == tuple(fields)
+
+    def get(self, model_type: type[BaseModel], key: tuple) -> Optional[Entity]:
+        entities = self._entities.get(model_type)
+        if entities is None:
+            return None
+        return entities.get(key)
+
+    def add(self, model_type: type[BaseModel], entity: Entity) -> None:
+        fields = self.natural_keys.get(model_type)
+        if fields is None:
+            return
+        key = tuple(getattr(entity, field) for field in fields)
+        with self._lock:
+            self._entities[model_type][key] = entity
+
+    def add_all(
+        self, model_type: type[BaseModel], entities: Iterable[Entity]
+    ) -> None:
+        for entity in entities:
+            self.add(model_type, entity)
+
+    def merge(self, other: IdentityMap) -> None:
+        for model_type, entities in other._entities.items():
+            self.add_all(model_type, entities.values())
+
+    def invalidate(
+        self,
+        model_type: Optional[type[BaseModel]] = None,
+        key: Optional[tuple] = None,
+    ) -> None:
+        with self._lock:
+            if model_type is None:
+                for entities in self._entities.values():
+                    entities.clear()
+            elif key is None:
+                self._entities.get(model_type, {}).clear()
+            else:
+                self._entities.get(model_type, {}).pop(key, None)
@@ -1,5 +1,3 @@
-from sqlalchemy import URL
-
 from database.engine import Database
 from database.enums import Gender, TeamType
 from database.schemas import (
@@ -9,15 +7,7 @@ from database.schemas import (
     TeamModel,
 )
 
-url_object = URL.create(
-    drivername='mysql+mysqlconnector',
-    username='footymanager',
-    password='?Ch0bbyF00ty',
-    host='localhost',
-    port=3306,
-    database='pyfooty',
-)
-database = Database(url_object)
+database = Database()
 
 with database.session() as session:
     liverpool = TeamModel(
@@ -1,40 +1,282 @@
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+import threading
+from typing import Any, Optional, Self
 
-from sqlalchemy import and_, select
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Select,
+    and_,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 
+from database.dialects import dialect_insert, model_to_row
 from database.engine import SessionFactory
 from database.exceptions import CompetitionNotFoundError
-from database.schemas import BaseModel, CompetitionModel, SeasonModel
+from database.identity_map import IdentityMap, NaturalKey
+from database.schemas import (
+    BaseModel,
+    CompetitionModel,
+    FixtureModel,
+    LogoModel,
+    PlayerInstanceModel,
+    SeasonModel,
+    TeamInstanceModel,
+    TeamModel,
+)
+from database.unit_of_work import UnitOfWork
 from entities.competition import Competition
 from entities.entity import Entity
 from entities.season import Season
+from entities.team import Team
+from global_utils import constants
+
+
+REFERENCE_NATURAL_KEYS: dict[type[BaseModel], NaturalKey] = {
+    CompetitionModel: ('name',),
+    SeasonModel: ('from_year',),
+    TeamModel: ('name', 'country', 'gender'),
+}
+
+LoaderOptions = Sequence[ExecutableOption]
+
+# The relationships to_dict reads for each model, loaded with the rows so
+# converting a result set costs a query per relationship rather than per row.
+# Collections are selectin loaded as joined collections cannot be streamed.
+DEFAULT_LOADER_OPTIONS: dict[type[BaseModel], LoaderOptions] = {
+    FixtureModel: (
+        joinedload(FixtureModel.season),
+        joinedload(FixtureModel.competition),
+        joinedload(FixtureModel.home_team),
+        joinedload(FixtureModel.away_team),
+    ),
+    TeamInstanceModel: (
+        joinedload(TeamInstanceModel.team),
+        selectinload(TeamInstanceModel.players),
+    ),
+    PlayerInstanceModel: (
+        joinedload(PlayerInstanceModel.player),
+        joinedload(PlayerInstanceModel.team),
+    ),
+}
+
+
+def _loader_options(
+    model_type: type[BaseModel], options: Optional[LoaderOptions]
+) -> LoaderOptions:
+    if options is None:
+        return DEFAULT_LOADER_OPTIONS.get(model_type, ())
+    return options
+
+
+def _fixture_filters(
+    competition_id: Optional[int], season_id: Optional[int]
+) -> list[ColumnElement[bool]]:
+    where = []
+    if competition_id is not None:
+        where.append(FixtureModel.competition_id == competition_id)
+    if season_id is not None:
+        where.append(FixtureModel.season_id == season_id)
+    return where
+
+
+def _supports_server_side_cursors(session: Session) -> bool:
+    return session.get_bind().dialect.supports_server_side_cursors
+
+
+def _keyset_page(
+    stmt: Select,
+    primary_key: Sequence[Column],
+    last_key: Optional[tuple],
+    chunk_size: int,
+) -> Select:
+    # Ordered by primary key, so a page starts after the last row of the
+    # page before and no rows are skipped over by an OFFSET
+    stmt = stmt.limit(chunk_size)
+    if last_key is None:
+        return stmt
+    if len(primary_key) == 1:
+        return stmt.where(primary_key[0] > last_key[0])
+    return stmt.where(tuple_(*primary_key) > last_key)
+
+
+def _partition_key(
+    partition: Sequence[Any], primary_key: Sequence[Column], scalars: bool
+) -> tuple:
+    last = partition[-1]
+    if scalars:
+        return inspect(last).identity
+    return tuple(last._mapping[column] for column in primary_key)
+
+
+def _read_partitions(
+    session: Session,
+    stmt: Select,
+    primary_key: Sequence[Column],
+    chunk_size: int,
+    *,
+    scalars: bool = False,
+) -> Iterator[Sequence[Any]]:
+    if _supports_server_side_cursors(session):
+        result = session.execute(stmt.execution_options(yield_per=chunk_size))
+        yield from (result.scalars() if scalars else result).partitions()
+        return
+    # Without a server side cursor the driver would buffer the whole result
+    # set, so it is read a page at a time by primary key instead
+    last_key = None
+    while True:
+        result = session.execute(
+            _keyset_page(stmt, primary_key, last_key, chunk_size)
+        )
+        partition = (result.scalars() if scalars else result).all()
+        if partition:
+            yield partition
+        if len(partition) < chunk_size:
+            return
+        last_key = _partition_key(partition, primary_key, scalars)
 
 
 class FootballRepository:
-    def __init__(self, session_factory: SessionFactory) -> None:
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        identity_map: Optional[IdentityMap] = None,
+    ) -> None:
         self.session_factory = session_factory
+        self.identity_map = (
+            identity_map
+            if identity_map is not None
+            else IdentityMap(REFERENCE_NATURAL_KEYS)
+        )
+        self._local = threading.local()
+
+    @property
+    def _unit_of_work(self) -> Optional[UnitOfWork]:
+        return getattr(self._local, 'unit_of_work', None)
+
+    @contextmanager
+    def unit_of_work(
+        self, flush_batch_size: int = constants.DB_FLUSH_BATCH_SIZE
+    ) -> Iterator[Self]:
+        if self._unit_of_work is not None:
+            raise RuntimeError('A unit of work is already in progress.')
+        with self.session_factory() as session:
+            unit_of_work = UnitOfWork(
+                session,
+                flush_batch_size,
+                IdentityMap(self.identity_map.natural_keys),
+            )
+            with self.join_unit_of_work(unit_of_work):
+                yield self
+                unit_of_work.flush()
+                session.commit()
+            self.identity_map.merge(unit_of_work.identity_map)
+
+    @contextmanager
+    def join_unit_of_work(self, unit_of_work: UnitOfWork) -> Iterator[Self]:
+        # Runs calls in a unit of work owned by the caller, which is then
+        # responsible for committing it
+        if self._unit_of_work is not None:
+            raise RuntimeError('A unit of work is already in progress.')
+        self._local.unit_of_work = unit_of_work
+        try:
+            yield self
+        finally:
+            self._local.unit_of_work = None
+
+    def _remember(
+        self, model_type: type[BaseModel], entities: Iterable[Entity]
+    ) -> None:
+        unit_of_work = self._unit_of_work
+        identity_map = (
+            unit_of_work.identity_map
+            if unit_of_work is not None
+            else self.identity_map
+        )
+        identity_map.add_all(model_type, entities)
+
+    def _recall(
+        self, model_type: type[BaseModel], key: tuple
+    ) -> Optional[Entity]:
+        unit_of_work = self._unit_of_work
+        if unit_of_work is not None:
+            entity = unit_of_work.identity_map.get(model_type, key)
+            if entity is not None:
+                return entity
+        return self.identity_map.get(model_type, key)
+
+    def invalidate_cache(
+        self,
+        model_type: Optional[type[BaseModel]] = None,
+        key: Optional[tuple] = None,
+    ) -> None:
+        # Needed after writes made outside the repository, other than those
+        # of a SqlResourceManager given this repository's identity map
+        self.identity_map.invalidate(model_type, key)
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        unit_of_work = self._unit_of_work
+        if unit_of_work is None:
+            with self.session_factory() as session:
+                yield session
+            return
+        # Staged models must be visible to any queries made in the unit
+        unit_of_work.flush()
+        yield unit_of_work.session
+
+    def _commit(self, session: Session) -> None:
+        # Within a unit of work everything is committed once, at the end
+        if self._unit_of_work is None:
+            session.commit()
+        else:
+            session.flush()
 
     def _add_entity(
         self, entity: Entity, model_type: type[BaseModel]
     ) -> Entity:
         model = model_type.from_entity(entity)
-        with self.session_factory() as session:
+        with self._session() as session:
             session.add(model)
+            self._commit(session)
+            entity = model.to_entity(validate=False)
+        self._remember(model_type, [entity])
+        return entity
+
+    def add_many(
+        self, entities: Iterable[Entity], model_type: type[BaseModel]
+    ) -> None:
+        models = [model_type.from_entity(entity) for entity in entities]
+        if self._unit_of_work is not None:
+            self._unit_of_work.add_all(models)
+            return
+        with self.session_factory() as session:
+            session.add_all(models)
             session.commit()
-            # session.refresh(entity_model)
-            return model.to_entity()
 
     def add_competition(self, competition: Competition) -> Competition:
         return self._add_entity(entity=competition, model_type=CompetitionModel)
 
     def get_competition_by_name(self, name: str) -> Competition:
-        with self.session_factory() as session:
+        competition = self._recall(CompetitionModel, (name,))
+        if competition is not None:
+            return competition
+        with self._session() as session:
             competition_model = session.scalars(
                 select(CompetitionModel).where(CompetitionModel.name == name)
             ).first()
             if not competition_model:
                 raise CompetitionNotFoundError(name)
-            return competition_model.to_entity()
+            competition = competition_model.to_entity(validate=False)
+        self._remember(CompetitionModel, [competition])
+        return competition
 
     def add_season(self, season: Season) -> Season:
         return self._add_entity(entity=season, model_type=SeasonModel)
@@ -42,7 +284,14 @@ class FootballRepository:
     def _get_or_create_entity(
         self, entity: Entity, model: BaseModel, fields: Iterable[str]
     ) -> Entity:
-        with self.session_factory() as session:
+        fields = list(fields)
+        if self.identity_map.is_natural_key(model, fields):
+            cached = self._recall(
+                model, tuple(getattr(entity, field) for field in fields)
+            )
+            if cached is not None:
+                return cached
+        with self._session() as session:
             entity_model = session.scalars(
                 select(model).where(
                     and_(
@@ -51,11 +300,265 @@ class FootballRepository:
                     )
                 )
             ).one_or_none()
-        if entity_model:
-            return entity_model.to_entity()
+            if entity_model:
+                entity = entity_model.to_entity(validate=False)
+                self._remember(model, [entity])
+                return entity
         return self._add_entity(entity=entity, model_type=model)
 
     def get_or_create_season(self, season: Season) -> Season:
         return self._get_or_create_entity(
             entity=season, model=SeasonModel, fields=['from_year']
         )
+
+    @staticmethod
+    def _select_by_keys(
+        session: Session,
+        model_type: type[BaseModel],
+        fields: list[str],
+        keys: Collection[tuple],
+    ) -> list[BaseModel]:
+        columns = [getattr(model_type, field) for field in fields]
+        if len(columns) == 1:
+            condition = columns[0].in_([key[0] for key in keys])
+        else:
+            condition = tuple_(*columns).in_(keys)
+        return session.scalars(select(model_type).where(condition)).all()
+
+    def _write_many(
+        self,
+        entities: Iterable[Entity],
+        model_type: type[BaseModel],
+        fields: Iterable[str],
+        *,
+        update: bool,
+    ) -> list[Entity]:
+        entities = list(entities)
+        if not entities:
+            return []
+        fields = list(fields)
+        keys = [
+            tuple(getattr(entity, field) for field in fields)
+            for entity in entities
+        ]
+
+        found = {}
+        if not update and self.identity_map.is_natural_key(model_type, fields):
+            for key in keys:
+                entity = self._recall(model_type, key)
+                if entity is not None:
+                    found[key] = entity
+
+        with self._session() as session:
+            # Converted straight away, as committing expires loaded models
+            missing_keys = set(keys).difference(found)
+            if not update and missing_keys:
+                found.update(
+                    (
+                        tuple(getattr(model, field) for field in fields),
+                        model.to_entity(validate=False),
+                    )
+                    for model in self._select_by_keys(
+                        session, model_type, fields, missing_keys
+                    )
+                )
+            # Keyed rows so duplicates within a batch are only written once
+            rows = {
+                key: model_to_row(model_type.from_entity(entity))
+                for key, entity in zip(keys, entities)
+                if key not in found
+            }
+            if rows:
+                stmt = dialect_insert(
+                    model_type.__table__,
+                    session.get_bind().dialect.name,
+                    fields,
+                    update=update,
+                )
+                session.execute(stmt, list(rows.values()))
+                self._commit(session)
+                found.update(
+                    (
+                        tuple(getattr(model, field) for field in fields),
+                        model.to_entity(validate=False),
+                    )
+                    for model in self._select_by_keys(
+                        session, model_type, fields, rows.keys()
+                    )
+                )
+        self._remember(model_type, found.values())
+        return [found[key] for key in keys]
+
+    def get_or_create_many(
+        self,
+        entities: Iterable[Entity],
+        model_type: type[BaseModel],
+        fields: Iterable[str],
+    ) -> list[Entity]:
+        return self._write_many(entities, model_type, fields, update=False)
+
+    def upsert_many(
+        self,
+        entities: Iterable[Entity],
+        model_type: type[BaseModel],
+        fields: Iterable[str],
+    ) -> list[Entity]:
+        return self._write_many(entities, model_type, fields, update=True)
+
+    def get_or_create_seasons(self, seasons: Iterable[Season]) -> list[Season]:
+        return self.get_or_create_many(
+            seasons, model_type=SeasonModel, fields=['from_year']
+        )
+
+    def get_or_create_teams(self, teams: Iterable[Team]) -> list[Team]:
+        return self.get_or_create_many(
+            teams, model_type=TeamModel, fields=['name', 'country', 'gender']
+        )
+
+    def update_team_logos(self, teams: Iterable[Team]) -> list[Team]:
+        # get_or_create_teams leaves existing rows as they are, so logos
+        # found after a team was first stored are set here
+        teams = list(teams)
+        if not teams:
+            return []
+        with self._session() as session:
+            session.execute(
+                update(TeamModel),
+                [{'id': team.id, 'logo_id': team.logo_id} for team in teams],
+            )
+            self._commit(session)
+        self._remember(TeamModel, teams)
+        return teams
+
+    def add_logos(self, blobs: Mapping[str, bytes]) -> dict[str, int]:
+        if not blobs:
+            return {}
+        with self._session() as session:
+            logo_ids = dict(
+                session.execute(
+                    select(LogoModel.hash, LogoModel.id).where(
+                        LogoModel.hash.in_(blobs)
+                    )
+                ).all()
+            )
+            new_logos = [
+                LogoModel(hash=content_hash, data=data)
+                for content_hash, data in blobs.items()
+                if content_hash not in logo_ids
+            ]
+            session.add_all(new_logos)
+            session.flush()
+            logo_ids.update((logo.hash, logo.id) for logo in new_logos)
+            self._commit(session)
+        return logo_ids
+
+    def get_models(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        options: Optional[LoaderOptions] = None,
+    ) -> list[BaseModel]:
+        stmt = (
+            select(model_type)
+            .where(*where)
+            .options(*_loader_options(model_type, options))
+        )
+        with self._session() as session:
+            return list(session.scalars(stmt).unique())
+
+    def get_entities(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        options: Optional[LoaderOptions] = None,
+    ) -> list[Entity]:
+        stmt = (
+            select(model_type)
+            .where(*where)
+            .options(*_loader_options(model_type, options))
+        )
+        with self._session() as session:
+            return BaseModel.to_entities(
+                session.scalars(stmt).unique(), validate=False
+            )
+
+    def get_fixtures(
+        self,
+        *,
+        competition_id: Optional[int] = None,
+        season_id: Optional[int] = None,
+        options: Optional[LoaderOptions] = None,
+    ) -> list[FixtureModel]:
+        # There is no fixture entity yet, so these are detached models with
+        # their relationships already loaded
+        return self.get_models(
+            FixtureModel,
+            *_fixture_filters(competition_id, season_id),
+            options=options,
+        )
+
+    def stream_entities(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+        options: Optional[LoaderOptions] = None,
+    ) -> Iterator[Entity]:
+        primary_key = list(model_type.__table__.primary_key)
+        stmt = (
+            select(model_type)
+            .where(*where)
+            .options(*_loader_options(model_type, options))
+            .order_by(*primary_key)
+        )
+        with self._session() as session:
+            for models in _read_partitions(
+                session, stmt, primary_key, chunk_size, scalars=True
+            ):
+                entities = BaseModel.to_entities(models, validate=False)
+                # Stop the session holding on to every model streamed so far
+                for model in models:
+                    session.expunge(model)
+                yield from entities
+
+    def stream_dataframes(
+        self,
+        model_type: type[BaseModel],
+        *where: ColumnElement[bool],
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        table = model_type.__table__
+        primary_key = list(table.primary_key)
+        stmt = select(table).where(*where).order_by(*primary_key)
+        columns = list(stmt.selected_columns.keys())
+        with self._session() as session:
+            for rows in _read_partitions(
+                session, stmt, primary_key, chunk_size
+            ):
+                yield pd.DataFrame.from_records(rows, columns=columns)
+
+    def stream_fixtures(
+        self,
+        *,
+        competition_id: Optional[int] = None,
+        season_id: Optional[int] = None,
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        return self.stream_dataframes(
+            FixtureModel,
+            *_fixture_filters(competition_id, season_id),
+            chunk_size=chunk_size,
+        )
+
+    def stream_player_appearances(
+        self,
+        *,
+        player_id: Optional[int] = None,
+        chunk_size: int = constants.DB_STREAM_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        where = []
+        if player_id is not None:
+            where.append(PlayerInstanceModel.player_id == player_id)
+        return self.stream_dataframes(
+            PlayerInstanceModel, *where, chunk_size=chunk_size
+        )
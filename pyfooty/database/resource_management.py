@@ -1,55 +1,341 @@
-from sqlalchemy import URL, text
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from enum import Enum, StrEnum, auto
+from itertools import chain, islice
+import os
+import tempfile
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Connection,
+    Table,
+    UniqueConstraint,
+    insert,
+    inspect,
+    text,
+)
 
 from database.engine import ConnectionFactory, Database
+from database.exceptions import SchemaVerificationError
+from database.identity_map import IdentityMap
 from database.schemas import BaseModel
+from global_utils import constants
+
+
+class ResetMode(StrEnum):
+    TRUNCATE = auto()
+    RECREATE = auto()
+
+
+def _is_mysql(connection: Connection) -> bool:
+    return connection.dialect.name in ('mysql', 'mariadb')
+
+
+def _quote(connection: Connection, name: str) -> str:
+    return connection.dialect.identifier_preparer.quote(name)
+
+
+@contextmanager
+def _foreign_key_checks_disabled(connection: Connection) -> Iterator[None]:
+    # Allows tables with circular dependencies to be emptied or dropped
+    if _is_mysql(connection):
+        connection.execute(text('SET FOREIGN_KEY_CHECKS = 0'))
+        try:
+            yield
+        finally:
+            connection.execute(text('SET FOREIGN_KEY_CHECKS = 1'))
+    elif connection.dialect.name == 'sqlite':
+        # Switching foreign keys is a no-op within a transaction, so the
+        # work is committed before they are switched back on
+        connection.commit()
+        connection.execute(text('PRAGMA foreign_keys = OFF'))
+        try:
+            yield
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.execute(text('PRAGMA foreign_keys = ON'))
+    else:
+        yield
+
+
+def _drop_tables(connection: Connection, table_names: Iterable[str]) -> None:
+    # Postgres has no switch for foreign key checks, so cascades instead
+    cascade = ' CASCADE' if connection.dialect.name == 'postgresql' else ''
+    with _foreign_key_checks_disabled(connection):
+        for table_name in table_names:
+            connection.execute(
+                text(
+                    'DROP TABLE IF EXISTS '
+                    f'{_quote(connection, table_name)}{cascade}'
+                )
+            )
+
+
+def _truncate_tables(connection: Connection, tables: list[Table]) -> None:
+    table_names = [_quote(connection, table.name) for table in tables]
+    if connection.dialect.name == 'postgresql':
+        connection.execute(
+            text(
+                f'TRUNCATE TABLE {", ".join(table_names)} '
+                'RESTART IDENTITY CASCADE'
+            )
+        )
+        return
+    # SQLite has no TRUNCATE, though it optimises an unfiltered DELETE
+    statement = 'TRUNCATE TABLE' if _is_mysql(connection) else 'DELETE FROM'
+    with _foreign_key_checks_disabled(connection):
+        for table_name in table_names:
+            connection.execute(text(f'{statement} {table_name}'))
+
+
+def _load_value(value: Any) -> Any:
+    # Enum columns store member names, the ORM normally does this conversion
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _escape_infile_value(value: Any) -> bytes:
+    if value is None:
+        return b'\\N'
+    if isinstance(value, bytes):
+        data = value
+    else:
+        data = str(value).encode('utf-8')
+    return (
+        data.replace(b'\\', b'\\\\')
+        .replace(b'\t', b'\\t')
+        .replace(b'\n', b'\\n')
+        .replace(b'\0', b'\\0')
+    )
+
+
+def _chunked(
+    rows: Iterable[tuple], chunk_size: int
+) -> Iterator[list[tuple]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _expected_keys(table: Table) -> tuple[set[tuple], set[tuple]]:
+    unique_keys = {
+        tuple(column.name for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    }
+    index_keys = set()
+    for index in table.indexes:
+        columns = tuple(column.name for column in index.columns)
+        (unique_keys if index.unique else index_keys).add(columns)
+    return unique_keys, index_keys
+
+
+def _reflected_keys(
+    connection: Connection, table_name: str
+) -> tuple[set[tuple], set[tuple]]:
+    inspector = inspect(connection)
+    # Some dialects report unique constraints as unique indexes, so both
+    # are checked
+    unique_keys = {
+        tuple(constraint['column_names'])
+        for constraint in inspector.get_unique_constraints(table_name)
+    }
+    index_keys = set()
+    for index in inspector.get_indexes(table_name):
+        columns = tuple(index['column_names'])
+        if index['unique']:
+            unique_keys.add(columns)
+        index_keys.add(columns)
+    # Unique constraints are backed by an index
+    return unique_keys, index_keys | unique_keys
 
 
 class SqlResourceManager:
-    def __init__(self, connection_factory: ConnectionFactory) -> None:
+    def __init__(
+        self,
+        connection_factory: ConnectionFactory,
+        *,
+        local_infile: bool = constants.DB_ALLOW_LOCAL_INFILE,
+        identity_map: Optional[IdentityMap] = None,
+    ) -> None:
         self.connection_factory = connection_factory
+        self.local_infile = local_infile
+        # A repository's identity map, so entities cached from rows which are
+        # deleted or replaced here are not handed out afterwards
+        self.identity_map = identity_map
+
+    def _invalidate(self, model_type: Optional[type[BaseModel]] = None):
+        if self.identity_map is not None:
+            self.identity_map.invalidate(model_type)
 
     def create_all_tables(self):
         with self.connection_factory() as connection:
             BaseModel.metadata.create_all(connection)
+            connection.commit()
+        self.verify_schema()
+
+    def verify_schema(self):
+        missing = []
+        with self.connection_factory() as connection:
+            table_names = set(inspect(connection).get_table_names())
+            for table in BaseModel.metadata.tables.values():
+                if table.name not in table_names:
+                    missing.append(f'table {table.name}')
+                    continue
+                expected_unique, expected_index = _expected_keys(table)
+                reflected_unique, reflected_index = _reflected_keys(
+                    connection, table.name
+                )
+                missing.extend(
+                    f'unique key {table.name}({", ".join(columns)})'
+                    for columns in sorted(expected_unique - reflected_unique)
+                )
+                missing.extend(
+                    f'index {table.name}({", ".join(columns)})'
+                    for columns in sorted(expected_index - reflected_index)
+                )
+        if missing:
+            raise SchemaVerificationError(missing)
 
     def delete_table(self, table_name: str):
         with self.connection_factory() as connection:
-            # Disable foreign key checks to allow deletion of table with circular dependencies
-            connection.execute(text('SET FOREIGN_KEY_CHECKS = 0;'))
+            _drop_tables(connection, [table_name])
+            connection.commit()
+        self._invalidate()
 
-            # Delete table
-            connection.execute(text(f'DROP TABLE IF EXISTS {table_name};'))
+    def delete_all_tables(self):
+        with self.connection_factory() as connection:
+            _drop_tables(connection, inspect(connection).get_table_names())
+            connection.commit()
+        self._invalidate()
 
-            # Re-enable foreign key checks
-            connection.execute(text('SET FOREIGN_KEY_CHECKS = 1;'))
+    def reset(self, mode: ResetMode = ResetMode.TRUNCATE):
+        tables = list(BaseModel.metadata.tables.values())
+        with self.connection_factory() as connection:
+            if mode == ResetMode.TRUNCATE:
+                _truncate_tables(connection, tables)
+            else:
+                # One transaction on Postgres, MySQL commits each DDL
+                # statement and SQLite commits to toggle foreign keys
+                _drop_tables(connection, [table.name for table in tables])
+                BaseModel.metadata.create_all(connection)
+            connection.commit()
+        self._invalidate()
 
-    def delete_all_tables(self):
+    def bulk_load(
+        self,
+        model_type: type[BaseModel],
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        chunk_size: int = constants.DB_FLUSH_BATCH_SIZE,
+    ) -> int:
+        rows = iter(rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return 0
+        table: Table = model_type.__table__
+        column_names = [
+            column.name for column in table.columns if column.name in first_row
+        ]
+        values = (
+            tuple(_load_value(row.get(name)) for name in column_names)
+            for row in chain([first_row], rows)
+        )
         with self.connection_factory() as connection:
-            # Disable foreign key checks to allow deletion of table with circular dependencies
-            connection.execute(text('SET FOREIGN_KEY_CHECKS = 0;'))
+            if connection.dialect.driver == 'psycopg':
+                count = self._copy(connection, table, column_names, values)
+            elif _is_mysql(connection) and self.local_infile:
+                count = self._load_data_local_infile(
+                    connection, table, column_names, values
+                )
+            else:
+                count = self._insert(
+                    connection, table, column_names, values, chunk_size
+                )
+            connection.commit()
+        self._invalidate(model_type)
+        return count
 
-            for table in connection.execute(text('SHOW TABLES;')):
-                connection.execute(text(f'DROP TABLE {table[0]};'))
+    @staticmethod
+    def _copy(
+        connection: Connection,
+        table: Table,
+        column_names: list[str],
+        values: Iterable[tuple],
+    ) -> int:
+        columns = ', '.join(_quote(connection, name) for name in column_names)
+        count = 0
+        cursor = connection.connection.driver_connection.cursor()
+        with cursor.copy(
+            f'COPY {_quote(connection, table.name)} ({columns}) FROM STDIN'
+        ) as copy:
+            for row in values:
+                copy.write_row(row)
+                count += 1
+        return count
 
-            # Re-enable foreign key checks
-            connection.execute(text('SET FOREIGN_KEY_CHECKS = 1;'))
+    @staticmethod
+    def _load_data_local_infile(
+        connection: Connection,
+        table: Table,
+        column_names: list[str],
+        values: Iterable[tuple],
+    ) -> int:
+        count = 0
+        # Staged on disk as the server pulls the whole file in one request
+        file_descriptor, path = tempfile.mkstemp(suffix='.tsv')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                for row in values:
+                    file.write(b'\t'.join(map(_escape_infile_value, row)))
+                    file.write(b'\n')
+                    count += 1
+            columns = ', '.join(
+                _quote(connection, name) for name in column_names
+            )
+            connection.execute(
+                text(
+                    'LOAD DATA LOCAL INFILE :path '
+                    f'INTO TABLE {_quote(connection, table.name)} '
+                    'CHARACTER SET utf8mb4 '
+                    f'({columns})'
+                ),
+                {'path': path},
+            )
+        finally:
+            os.remove(path)
+        return count
+
+    @staticmethod
+    def _insert(
+        connection: Connection,
+        table: Table,
+        column_names: list[str],
+        values: Iterable[tuple],
+        chunk_size: int,
+    ) -> int:
+        count = 0
+        for chunk in _chunked(values, chunk_size):
+            connection.execute(
+                insert(table),
+                [dict(zip(column_names, row)) for row in chunk],
+            )
+            count += len(chunk)
+        return count
 
     def make_column_nullable(self, table_name: str):
         pass
 
 
 if __name__ == '__main__':
-    url_object = URL.create(
-        drivername='mysql+mysqlconnector',
-        username='footymanager',
-        password='?Ch0bbyF00ty',
-        host='localhost',
-        port=3306,
-        database='pyfooty',
-    )
-    database = Database(url_object)
+    database = Database()
     resource_manager = SqlResourceManager(
-        connection_factory=database.connection
+        connection_factory=database.connection,
+        local_infile=database.config.allow_local_infile,
     )
-    resource_manager.delete_all_tables()
-    resource_manager.create_all_tables()
+    resource_manager.reset(ResetMode.RECREATE)
+    resource_manager.verify_schema()
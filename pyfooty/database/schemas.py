@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from datetime import date
 from typing import Optional, Self
 
@@ -6,8 +7,10 @@ from sqlalchemy import (
     String,
     Date,
     ForeignKey,
+    Index,
     Integer,
     Enum,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -24,6 +27,11 @@ from database.enums import (
     CompetitionType,
     CompetitionFormat,
 )
+from database.entity_mapping import (
+    get_entity_mapping,
+    get_entity_type,
+    maps_to_entity,
+)
 from database.sqlalchemy_dict_mixin import SqlAlchemyDictMixin
 from entities.competition import (
     Competition,
@@ -32,23 +40,61 @@ from entities.competition import (
 )
 from entities.entity import Entity
 from entities.season import Season
+from entities.team import Team
 
 
 class BaseModel(DeclarativeBase, SqlAlchemyDictMixin):
     @property
     def entity_type(self) -> type[Entity]:
-        raise NotImplementedError(
-            'Corresponding entity type has not been set for '
-            f'model: {self.__class__}.'
-        )
+        entity_type = get_entity_type(self.__class__)
+        if entity_type is None:
+            raise NotImplementedError(
+                'Corresponding entity type has not been set for '
+                f'model: {self.__class__}.'
+            )
+        return entity_type
 
     @classmethod
     def from_entity(cls, entity: Entity) -> Self:
+        mapping = get_entity_mapping(cls)
+        if mapping is not None and isinstance(entity, mapping.entity_type):
+            return mapping.to_model(entity)
         return cls.from_dict(entity.to_dict(deep=False))
 
-    def to_entity(self) -> Entity:
+    def to_entity(self, *, validate: bool = True) -> Entity:
+        mapping = get_entity_mapping(self.__class__)
+        if mapping is not None:
+            return mapping.to_entity(self, validate=validate)
         return self.entity_type.from_dict(self.to_dict())
 
+    @classmethod
+    def from_entities(cls, entities: Iterable[Entity]) -> list[Self]:
+        mapping = get_entity_mapping(cls)
+        entities = list(entities)
+        if mapping is not None and all(
+            isinstance(entity, mapping.entity_type) for entity in entities
+        ):
+            return [mapping.to_model(entity) for entity in entities]
+        return cls.from_records(
+            entity.to_dict(deep=False) for entity in entities
+        )
+
+    @staticmethod
+    def to_entities(
+        models: Iterable['BaseModel'], *, validate: bool = True
+    ) -> list[Entity]:
+        models = list(models)
+        if not models:
+            return []
+        mapping = get_entity_mapping(models[0].__class__)
+        if mapping is not None:
+            return [
+                mapping.to_entity(model, validate=validate) for model in models
+            ]
+        return models[0].entity_type.from_records(
+            BaseModel.to_records(models)
+        )
+
 
 class PlayerModel(BaseModel):
     __tablename__ = 'player'
@@ -72,20 +118,36 @@ class PlayerInstanceModel(BaseModel):
     team: Mapped['TeamInstanceModel'] = relationship(back_populates='players')
 
 
+@maps_to_entity(Team)
 class TeamModel(BaseModel):
     __tablename__ = 'team'
+    __table_args__ = (
+        UniqueConstraint(
+            'name', 'country', 'gender', name='uq_team_natural_key'
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(30))
     gender: Mapped[Gender] = mapped_column(Enum(Gender))
     country: Mapped[str] = mapped_column(String(30))
     type: Mapped[TeamType] = mapped_column(Enum(TeamType))
-    year_founded: Mapped[int] = mapped_column(Integer())
-    logo: Mapped[Optional[LargeBinary]] = mapped_column(LargeBinary())
+    year_founded: Mapped[Optional[int]] = mapped_column(Integer())
+    logo_id: Mapped[Optional[int]] = mapped_column(ForeignKey('logo.id'))
+
+
+class LogoModel(BaseModel):
+    __tablename__ = 'logo'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    hash: Mapped[str] = mapped_column(String(64), unique=True)
+    # Deferred so loading a logo row never pulls the image bytes along
+    data: Mapped[bytes] = mapped_column(LargeBinary(), deferred=True)
 
 
 class TeamInstanceModel(BaseModel):
     __tablename__ = 'team_instance'
+    __table_args__ = (Index('ix_team_instance_fixture', 'fixture_id'),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     team_id: Mapped[int] = mapped_column(ForeignKey('team.id'))
@@ -97,11 +159,12 @@ class TeamInstanceModel(BaseModel):
     )
 
 
+@maps_to_entity(Competition)
 class CompetitionModel(BaseModel):
     __tablename__ = 'competition'
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(String(30), index=True)
+    name: Mapped[str] = mapped_column(String(30), index=True, unique=True)
     alt_name: Mapped[str] = mapped_column(String(30))
     gender: Mapped[Gender] = mapped_column(Enum(Gender))
     country: Mapped[Optional[str]] = mapped_column(String(30))
@@ -118,25 +181,32 @@ class CompetitionModel(BaseModel):
 
     url_info: Mapped[CompetitionUrlInfo] = composite('url_number', 'url_name')
 
-    @property
-    def entity_type(self) -> type[Entity]:
-        return Competition
-
 
+@maps_to_entity(Season)
 class SeasonModel(BaseModel):
     __tablename__ = 'season'
+    __table_args__ = (
+        UniqueConstraint('from_year', name='uq_season_natural_key'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     from_year: Mapped[int] = mapped_column(Integer())
     to_year: Mapped[int] = mapped_column(Integer())
 
-    @property
-    def entity_type(self) -> type[Entity]:
-        return Season
-
 
 class FixtureModel(BaseModel):
     __tablename__ = 'fixture'
+    __table_args__ = (
+        UniqueConstraint(
+            'season_id',
+            'competition_id',
+            'home_team_id',
+            'away_team_id',
+            'date',
+            name='uq_fixture_natural_key',
+        ),
+        Index('ix_fixture_competition_season', 'competition_id', 'season_id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     date: Mapped[date] = mapped_column(Date())
@@ -1,8 +1,16 @@
-from typing import Any, Optional, Self, get_type_hints
-from collections.abc import Mapping
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Self,
+    TYPE_CHECKING,
+    get_type_hints,
+)
+from collections.abc import Iterable, Mapping, Sequence
+from functools import cache
 import warnings
 
-from attrs import define, field
+from attrs import define, evolve, field, frozen
 from sqlalchemy import Column, ForeignKey
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -11,6 +19,11 @@ from sqlalchemy.orm import (
     Composite,
 )
 
+from entities.dict_mixin import dataframe_columns, warn_unrecognised_field
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class MissingForeignKeyDictMixinError(AttributeError):
     def __init__(self, obj: Any) -> None:
@@ -32,25 +45,65 @@ class Field:
     property: Optional[Property] = field(default=None)
 
 
-def _get_class_fields_dict(
-    cls: type[DeclarativeBase], *, include_composites: bool = False
-) -> dict[str, Field]:
-    type_hints = get_type_hints(cls)
+Decoder = Callable[[Any], tuple[str, Any]]
+
+
+@frozen
+class _ModelCodec:
+    # fields leaves out the columns backing composites, all_fields has both
+    fields: dict[str, Field]
+    all_fields: dict[str, Field]
+    decoders: dict[str, Decoder]
+    encoded_names: tuple[str, ...]
 
-    composite_field_components = []
 
+def _compile_fields(cls: type[DeclarativeBase]) -> dict[str, Field]:
     fields_dict = {}
-    for name, type_hint in type_hints.items():
+    for name, type_hint in get_type_hints(cls).items():
         property = getattr(cls, name).property
-        if isinstance(property, Composite):
-            composite_field_components.extend(property.attrs)
         fields_dict[name] = Field(name, type=type_hint, property=property)
+    return fields_dict
 
-    if not include_composites:
-        for name in composite_field_components:
-            fields_dict.pop(name)
 
-    return fields_dict
+@cache
+def _get_codec(cls: type[DeclarativeBase]) -> _ModelCodec:
+    # Compiled on first use, once every mapped class has been declared and
+    # forward references can be resolved
+    all_fields = _compile_fields(cls)
+    composite_field_components = {
+        name
+        for field in all_fields.values()
+        if isinstance(field.property, Composite)
+        for name in field.property.attrs
+    }
+    fields = {
+        name: field
+        for name, field in all_fields.items()
+        if name not in composite_field_components
+    }
+    decoders = {
+        name: (
+            _relationship_decoder(field)
+            if isinstance(field.property, Relationship)
+            else _column_decoder(name)
+        )
+        for name, field in fields.items()
+    }
+    return _ModelCodec(
+        fields=fields,
+        all_fields=all_fields,
+        decoders=decoders,
+        encoded_names=tuple(fields),
+    )
+
+
+def _get_class_fields_dict(
+    cls: type[DeclarativeBase], *, include_composites: bool = False
+) -> dict[str, Field]:
+    codec = _get_codec(cls)
+    fields_dict = codec.all_fields if include_composites else codec.fields
+    # Copied as callers are free to modify the fields they are given
+    return {name: evolve(field) for name, field in fields_dict.items()}
 
 
 def _get_instance_fields_dict(
@@ -95,67 +148,103 @@ def _get_foreign_key(column: Column) -> ForeignKey:
     return next(iter(column.foreign_keys))
 
 
-class SqlAlchemyDictMixin:
-    @staticmethod
-    def _get_field_from_relationship(attr_val: Any, field: Field):
-        foreign_key_col = _get_foreign_key_col(field.property)
-        foreign_key = _get_foreign_key(foreign_key_col)
+def _column_decoder(name: str) -> Decoder:
+    def decode(attr_val: Any) -> tuple[str, Any]:
+        return name, attr_val
+
+    return decode
+
+
+def _relationship_decoder(field: Field) -> Decoder:
+    foreign_key_col = _get_foreign_key_col(field.property)
+    if not foreign_key_col.foreign_keys:
+        # The one side of a one to many, which holds no foreign key itself
+        return _column_decoder(field.name)
+    foreign_key_name = _get_foreign_key(foreign_key_col).column.name
+    foreign_key_cls = field.property.entity.class_
+
+    def decode(attr_val: Any) -> tuple[str, Any]:
         foreign_key_id = (
-            attr_val.get(foreign_key.column.name)
+            attr_val.get(foreign_key_name)
             if isinstance(attr_val, dict)
-            else getattr(attr_val, foreign_key.column.name, None)
+            else getattr(attr_val, foreign_key_name, None)
         )
         if foreign_key_id is not None:
-            return Field(foreign_key_col.name, value=foreign_key_id)
+            return foreign_key_col.name, foreign_key_id
 
-        foreign_key_cls = field.property.entity.class_
-        if isinstance(attr_val, dict):
-            try:
-                return Field(
-                    field.name,
-                    value=foreign_key_cls.from_dict(attr_val),
-                )
-            except AttributeError as exception:
-                raise MissingForeignKeyDictMixinError(foreign_key_cls)
-        try:
-            return Field(
-                field.name,
-                value=foreign_key_cls.from_dict(attr_val.to_dict(deep=False)),
-            )
-        except AttributeError as exception:
+        from_dict = getattr(foreign_key_cls, 'from_dict', None)
+        if from_dict is None:
             raise MissingForeignKeyDictMixinError(foreign_key_cls)
-        except TypeError as exception:
-            raise exception(
+        if isinstance(attr_val, dict):
+            return field.name, from_dict(attr_val)
+        to_dict = getattr(attr_val, 'to_dict', None)
+        if to_dict is None:
+            raise TypeError(
                 'All inputs for foreign key classes must either '
                 'be of type: dict, or define a "to_dict" method.'
             )
+        return field.name, from_dict(to_dict(deep=False))
+
+    return decode
 
-    @classmethod
-    def _get_model_field(cls, attr_val: Any, field: Field):
-        if isinstance(field.property, Relationship):
-            return cls._get_field_from_relationship(attr_val, field)
-        return Field(field.name, value=attr_val)
 
+class SqlAlchemyDictMixin:
     @classmethod
     def from_dict(cls, obj: Mapping) -> Self:
-        fields_dict = get_fields_dict(cls)
+        decoders = _get_codec(cls).decoders
 
         model_attrs = {}
         for attr_name, attr_val in obj.items():
-            field = fields_dict.get(attr_name)
-            if field is None:
-                warnings.warn(
-                    f'Key: {attr_name}, '
-                    f'not a recognised field in class: {cls.__name__}. '
-                    'Remove this key from input to avoid this warning.',
-                    RuntimeWarning,
-                )
+            decode = decoders.get(attr_name)
+            if decode is None:
+                warn_unrecognised_field(cls, attr_name)
                 continue
-            new_field = cls._get_model_field(attr_val=attr_val, field=field)
-            model_attrs[new_field.name] = new_field.value
+            name, value = decode(attr_val)
+            model_attrs[name] = value
 
         return cls(**model_attrs)
 
+    @classmethod
+    def _from_columns(
+        cls, columns: Mapping[str, Sequence], length: int
+    ) -> list[Self]:
+        decoders = _get_codec(cls).decoders
+        decoded = []
+        for name, values in columns.items():
+            decode = decoders.get(name)
+            if decode is None:
+                warn_unrecognised_field(cls, name)
+                continue
+            decoded.append(map(decode, values))
+        # Each row is a tuple of decoded (name, value) pairs
+        rows = zip(*decoded) if decoded else [()] * length
+        return [cls(**dict(row)) for row in rows]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> list[Self]:
+        records = list(records)
+        if not records:
+            return []
+        keys = records[0].keys()
+        if any(record.keys() != keys for record in records):
+            return [cls.from_dict(record) for record in records]
+        return cls._from_columns(
+            {key: [record[key] for record in records] for key in keys},
+            len(records),
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> list[Self]:
+        return cls._from_columns(dataframe_columns(df), len(df))
+
+    @staticmethod
+    def to_records(
+        instances: Iterable['SqlAlchemyDictMixin'],
+    ) -> list[dict[str, Any]]:
+        return [instance.to_dict() for instance in instances]
+
     def to_dict(self) -> dict[str, Any]:
-        fields_dict = get_fields_dict(self)
-        return {name: field.value for name, field in fields_dict.items()}
+        return {
+            name: getattr(self, name)
+            for name in _get_codec(self.__class__).encoded_names
+        }
@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session
+
+from database.identity_map import IdentityMap
+from database.schemas import BaseModel
+
+
+class UnitOfWork:
+    def __init__(
+        self,
+        session: Session,
+        flush_batch_size: int,
+        identity_map: IdentityMap,
+    ) -> None:
+        self.session = session
+        self.flush_batch_size = flush_batch_size
+        # Entities are only published to the repository identity map once
+        # the unit commits, so a rollback never leaves stale ids cached
+        self.identity_map = identity_map
+        self._pending = 0
+
+    def add(self, model: BaseModel) -> None:
+        self.add_all([model])
+
+    def add_all(self, models: list[BaseModel]) -> None:
+        self.session.add_all(models)
+        self._pending += len(models)
+        if self._pending >= self.flush_batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self.session.flush()
+            self._pending = 0
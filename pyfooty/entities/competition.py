@@ -1,3 +1,4 @@
+from functools import cache
 import json
 from pathlib import Path
 from typing import Optional
@@ -76,6 +77,7 @@ class Competition(Entity):
             )
 
 
+@cache
 def get_competition_dict() -> dict[str, Competition]:
     pyfooty_path = Path(__file__).parent.parent
     competitions_file_path = pyfooty_path / 'global_utils/competitions.json'
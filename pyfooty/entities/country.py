@@ -1,5 +1,4 @@
 from attrs import frozen, field, validators
-from sqlalchemy import URL
 
 from database.engine import Database
 from global_utils import constants
@@ -16,14 +15,7 @@ class Country:
     database: Database = field(validator=validators.instance_of(Database))
 
 
-url_object = URL.create(
-    drivername='mysql+mysqlconnector',
-    username='footymanager',
-    password='?Ch0bbyF00ty',
-    host='localhost',
-    port=3306,
-    database='pyfooty',
-)
-database = Database(url_object)
-country = Country(name='england', database=database)
-print(country)
+if __name__ == '__main__':
+    database = Database()
+    country = Country(name='england', database=database)
+    print(country)
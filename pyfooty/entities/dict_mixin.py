@@ -1,13 +1,28 @@
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping, Sequence
 import dataclasses
 from enum import Enum, EnumType
+from functools import cache
 import inspect
-from types import NoneType
-from typing import Any, NamedTuple, Optional, Self, get_type_hints
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    NamedTuple,
+    Optional,
+    Self,
+    TYPE_CHECKING,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 import warnings
 
 import attrs
 
+if TYPE_CHECKING:
+    # Only needed for annotations, pandas is slow to import
+    import pandas as pd
+
 
 def has_dict_mixin(obj: Any) -> bool:
     return issubclass(obj, DictMixin) or isinstance(obj, DictMixin)
@@ -48,6 +63,24 @@ def instance_dict(
     return vars(instance)
 
 
+def dataframe_columns(df: 'pd.DataFrame') -> dict[str, list]:
+    # Nullable dtypes stop integer columns with gaps arriving as floats, and
+    # missing values become None so they convert as they would from a dict
+    return {
+        name: column.astype(object).where(column.notna(), None).tolist()
+        for name, column in df.convert_dtypes().items()
+    }
+
+
+def warn_unrecognised_field(cls: type, name: str) -> None:
+    warnings.warn(
+        f'Key: {name}, '
+        f'not a recognised field in class: {cls.__name__}. '
+        'Remove this key from input to avoid this warning.',
+        RuntimeWarning,
+    )
+
+
 def _class_fields_dict(cls: type) -> dict[str, Field]:
     type_hints = get_type_hints(cls)
     if hasattr(cls, '__init__'):
@@ -79,7 +112,111 @@ def fields_dict(cls: type | Any) -> dict[str, Field]:
     return _instance_fields_dict(cls)
 
 
+Converter = Callable[[Any], Any]
+
+
+def _passthrough(field_val: Any) -> Any:
+    return field_val
+
+
+def _none_converter(field_val: Any) -> None:
+    if field_val is not None:
+        raise TypeError(
+            f'Value: {field_val}, cannot be coerced to type: NoneType'
+        )
+    return None
+
+
+def _optional_converter(converter: Converter) -> Converter:
+    def convert(field_val: Any) -> Any:
+        if field_val is None:
+            return None
+        return converter(field_val)
+
+    return convert
+
+
+def _union_converter(field_type: Any, args: tuple) -> Converter:
+    converters = [_compile_converter(arg) for arg in args]
+
+    def convert(field_val: Any) -> Any:
+        if isinstance(field_val, field_type):
+            return field_val
+        for converter in converters:
+            try:
+                return converter(field_val)
+            except TypeError:
+                continue
+        raise TypeError(
+            f'Value: {field_val}, cannot be coerced to type: {field_type}'
+        )
+
+    return convert
+
+
+def _dict_mixin_converter(field_type: type) -> Converter:
+    def convert(field_val: Any) -> Any:
+        if isinstance(field_val, field_type):
+            return field_val
+        return field_type.from_dict(field_val)
+
+    return convert
+
+
+def _enum_converter(field_type: EnumType) -> Converter:
+    def convert(field_val: Any) -> Any:
+        if isinstance(field_val, field_type):
+            return field_val
+        return get_enum(field_val, field_type)
+
+    return convert
+
+
+def _class_converter(field_type: type) -> Converter:
+    def convert(field_val: Any) -> Any:
+        if isinstance(field_val, field_type):
+            return field_val
+        if isinstance(field_val, Mapping):
+            return field_type(**field_val)
+        return field_type(field_val)
+
+    return convert
+
+
+def _compile_converter(field_type: Any) -> Converter:
+    if field_type is None or field_type is Any:
+        return _passthrough
+    if field_type is NoneType:
+        return _none_converter
+    if get_origin(field_type) in (Union, UnionType):
+        args = get_args(field_type)
+        if NoneType in args and len(args) == 2:
+            (arg,) = (arg for arg in args if arg is not NoneType)
+            return _optional_converter(_compile_converter(arg))
+        return _union_converter(field_type, args)
+    if not isinstance(field_type, type):
+        # Parameterised generics and the like keep the general resolution
+        return lambda field_val: DictMixin._get_attribute(field_val, field_type)
+    if has_dict_mixin(field_type):
+        return _dict_mixin_converter(field_type)
+    if is_enum(field_type):
+        return _enum_converter(field_type)
+    return _class_converter(field_type)
+
+
+@cache
+def _get_converters(cls: type) -> dict[str, Converter]:
+    # Resolved once per class, fields_dict is far too slow to run per call
+    return {
+        name: _compile_converter(field.type)
+        for name, field in fields_dict(cls).items()
+    }
+
+
 class DictMixin:
+    # Empty, so slotted attrs subclasses do not get an instance __dict__
+    __slots__ = ()
+
     @staticmethod
     def _get_attribute(field_val: Any, field_type: type) -> Any:
         if field_type is NoneType and field_val is not None:
@@ -104,20 +241,55 @@ class DictMixin:
 
     @classmethod
     def from_dict(cls, obj: Mapping) -> Self:
-        fields = fields_dict(cls)
+        converters = _get_converters(cls)
         attributes = {}
         for attr_name, attr_val in obj.items():
-            field = fields.get(attr_name)
-            if field is None:
-                warnings.warn(
-                    f'Key: {attr_name}, '
-                    f'not a recognised field in class: {cls.__name__}. '
-                    'Remove this key from input to avoid this warning.',
-                    RuntimeWarning,
-                )
+            convert = converters.get(attr_name)
+            if convert is None:
+                warn_unrecognised_field(cls, attr_name)
                 continue
-            attributes[attr_name] = cls._get_attribute(attr_val, field.type)
+            attributes[attr_name] = convert(attr_val)
         return cls(**attributes)
 
+    @classmethod
+    def _from_columns(
+        cls, columns: Mapping[str, Sequence], length: int
+    ) -> list[Self]:
+        converters = _get_converters(cls)
+        converted = {}
+        for name, values in columns.items():
+            convert = converters.get(name)
+            if convert is None:
+                warn_unrecognised_field(cls, name)
+                continue
+            converted[name] = list(map(convert, values))
+        names = list(converted)
+        rows = zip(*converted.values()) if converted else [()] * length
+        return [cls(**dict(zip(names, row))) for row in rows]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> list[Self]:
+        records = list(records)
+        if not records:
+            return []
+        keys = records[0].keys()
+        if any(record.keys() != keys for record in records):
+            return [cls.from_dict(record) for record in records]
+        # Converted a column at a time when every record has the same keys
+        return cls._from_columns(
+            {key: [record[key] for record in records] for key in keys},
+            len(records),
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> list[Self]:
+        return cls._from_columns(dataframe_columns(df), len(df))
+
+    @staticmethod
+    def to_records(
+        instances: Iterable['DictMixin'], deep: bool = True
+    ) -> list[dict]:
+        return [instance.to_dict(deep=deep) for instance in instances]
+
     def to_dict(self, deep: bool = True) -> dict:
         return instance_dict(self, deep=deep)
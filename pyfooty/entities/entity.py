@@ -26,4 +26,4 @@ class EntityOld(ABC):
 
 
 class Entity(DictMixin):
-    ...
+    __slots__ = ()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterator, Literal, Optional, Self
 from attrs import frozen, field, validators
+from entities.entity import Entity
 from entities.utils import get_current_year
 
 from scraping._local_utils import _split_on_dash_or_endash
@@ -9,9 +11,17 @@ from scraping._local_utils import _split_on_dash_or_endash
 MINIMUM_VALID_YEAR = 2_000
 ENDASH = chr(8211)
 
+# Shared Season instances by from_year, only ever holding seasons without an id
+_INTERNED_SEASONS: dict[int, Season] = {}
+
+
+@lru_cache(maxsize=1_024)
+def _parse_season_string(season: str) -> tuple[int, ...]:
+    return tuple(int(year) for year in _split_on_dash_or_endash(season))
+
 
 @frozen(order=True)
-class Season:
+class Season(Entity):
     id: Optional[int] = field(default=None, kw_only=True, order=False)
     from_year: int = field(
         converter=int,
@@ -40,12 +50,20 @@ class Season:
                 'to_year must be exactly 1 year greater than from_year'
             )
 
+    @classmethod
+    def interned(cls, from_year: int, to_year: Optional[int] = None) -> Self:
+        season = _INTERNED_SEASONS.get(from_year)
+        if season is None:
+            season = cls(from_year)
+            season = _INTERNED_SEASONS.setdefault(season.from_year, season)
+        if to_year is not None and to_year != season.to_year:
+            # Constructed in full to raise the usual validation error
+            return cls(from_year, to_year)
+        return season
+
     @classmethod
     def from_string(cls, season: str) -> Self:
-        split_season = [int(year) for year in _split_on_dash_or_endash(season)]
-        if len(split_season) == 1:
-            return cls(split_season[0])
-        return cls(split_season[0], split_season[1])
+        return cls.interned(*_parse_season_string(season)[:2])
 
     def to_string(self, dash_type: Literal['dash', 'endash'] = 'dash') -> str:
         if dash_type not in ('dash', 'endash'):
@@ -57,7 +75,7 @@ class Season:
         return f'{self.from_year}{ENDASH}{self.to_year}'
 
     def increment(self, years: int) -> Season:
-        return Season(self.from_year + years)
+        return Season.interned(self.from_year + years)
 
     def next(self) -> Season:
         return self.increment(years=1)
@@ -72,7 +90,7 @@ def convert_to_season(
     if isinstance(season_repr, Season):
         return season_repr
     if isinstance(season_repr, int):
-        return Season(season_repr)
+        return Season.interned(season_repr)
     if isinstance(season_repr, str):
         return Season.from_string(season_repr)
     raise TypeError(f'Cannot convert type: {type(season_repr)} to Season')
@@ -93,11 +111,13 @@ def season_range(
     include_start = inclusive in ('both', 'left')
     include_end = inclusive in ('both', 'right')
 
-    # Generate all seasons from from_season to to_season (inclusive)
-    current_season = start if include_start else start.next()
-    end = end if include_end else end.previous()
-    while current_season <= end:
-        yield current_season
-
-        # Increment to the next season
-        current_season = current_season.next()
+    # Steps through the years, so no Season is built beyond a cache lookup
+    first_year = start.from_year if include_start else start.from_year + 1
+    last_year = end.from_year if include_end else end.from_year - 1
+    for year in range(first_year, last_year + 1):
+        if include_start and year == start.from_year:
+            yield start
+        elif include_end and year == end.from_year:
+            yield end
+        else:
+            yield Season.interned(year)
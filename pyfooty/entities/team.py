@@ -13,9 +13,10 @@ class Team(Entity):
     gender: Gender
     country: str
     type: TeamType
-    year_founded: int = field(
+    year_founded: Optional[int] = field(
         default=None,
         validator=validators.optional(
             [validators.instance_of(int), validators.le(get_current_year())]
         ),
     )
+    logo_id: Optional[int] = field(default=None)
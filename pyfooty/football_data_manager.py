@@ -1,21 +1,51 @@
+import logging
 from typing import Optional
-from sqlalchemy import URL
+from attrs import evolve
 from database.engine import Database
 from database.repository import FootballRepository
 from database.schemas import CompetitionModel
 from entities.competition import Competition
 from entities.season import Season, season_range
-from scraping.scraper import FootballScraper
+from scraping.logos import LogoDownloader
+from scraping.scraper import FootballScraper, ScrapedTeam
 from scraping._exceptions import CompetitionNotSupportedError
 from database.exceptions import CompetitionNotFoundError
+from ingest_manifest import IngestManifest, IngestStage
+
+logger = logging.getLogger(__name__)
 
 
 class FootballDataManager:
     def __init__(
-        self, scraper: FootballScraper, repository: FootballRepository
+        self,
+        scraper: FootballScraper,
+        repository: FootballRepository,
+        manifest: Optional[IngestManifest] = None,
+        logo_downloader: Optional[LogoDownloader] = None,
+        *,
+        refresh_current_season: bool = True,
     ) -> None:
         self.scraper = scraper
         self.repository = repository
+        self.manifest = manifest if manifest is not None else IngestManifest()
+        self.logo_downloader = (
+            logo_downloader if logo_downloader is not None else LogoDownloader()
+        )
+        self.refresh_current_season = refresh_current_season
+        # Ids of logos already committed, by content hash, as the downloader
+        # discards each blob once it is committed
+        self._logo_ids: dict[str, int] = {}
+
+    def _pending_stages(
+        self, competition: Competition, season: Season
+    ) -> list[IngestStage]:
+        # The current season is still being played, so it is never complete
+        if (
+            self.refresh_current_season
+            and season.from_year == Season().from_year
+        ):
+            return list(IngestStage)
+        return self.manifest.pending_stages(competition.name, season)
 
     def _get_competition(self, competition_name: str) -> Optional[Competition]:
         try:
@@ -31,6 +61,54 @@ class FootballDataManager:
                 return
             return self.repository.add_competition(competition)
 
+    def _download_logos(
+        self, scraped_teams: list[ScrapedTeam]
+    ) -> dict[str, str]:
+        return self.logo_downloader.download(
+            team.logo_url
+            for team in scraped_teams
+            if team.logo_url is not None
+        )
+
+    def _add_teams(
+        self,
+        repository: FootballRepository,
+        competition: Competition,
+        scraped_teams: list[ScrapedTeam],
+        logo_hashes: dict[str, str],
+    ) -> dict[str, int]:
+        content_hashes = set(logo_hashes.values())
+        logo_ids = {
+            content_hash: self._logo_ids[content_hash]
+            for content_hash in content_hashes
+            if content_hash in self._logo_ids
+        }
+        # Stored by hash, so this is safe to repeat after a rollback
+        logo_ids.update(
+            repository.add_logos(
+                self.logo_downloader.get_blobs(
+                    content_hashes.difference(logo_ids)
+                )
+            )
+        )
+        teams = []
+        for scraped_team in scraped_teams:
+            if scraped_team.name is None:
+                logger.warning(f'No team name found at: {scraped_team.url}')
+                continue
+            logo_hash = logo_hashes.get(scraped_team.logo_url)
+            teams.append(
+                scraped_team.to_team(competition, logo_ids.get(logo_hash))
+            )
+        stored_teams = repository.get_or_create_teams(teams)
+        repository.update_team_logos(
+            evolve(stored_team, logo_id=team.logo_id)
+            for team, stored_team in zip(teams, stored_teams)
+            if team.logo_id is not None
+            and team.logo_id != stored_team.logo_id
+        )
+        return logo_ids
+
     def _process_competition_seasons(
         self,
         competition: Competition,
@@ -38,11 +116,35 @@ class FootballDataManager:
         to_season: Season | str | int = Season(),
     ):
         for season in season_range(from_season, to_season):
-            season = self.repository.get_or_create_season(season)
-            teams = self.scraper.scrape_teams(
-                competition_name=competition.name, season=season
-            )
-            teams = self.repository.get_or_create_teams(teams)
+            pending_stages = self._pending_stages(competition, season)
+            if not pending_stages:
+                logger.info(
+                    f'Skipping {season} {competition.name} season, '
+                    'already ingested.'
+                )
+                continue
+            # Scraped up front, so no transaction is held open across what
+            # are rate limited network requests
+            scraped_teams = []
+            logo_hashes = {}
+            if IngestStage.TEAMS in pending_stages:
+                scraped_teams = self.scraper.scrape_teams(
+                    competition_name=competition.name, season=season
+                )
+                logo_hashes = self._download_logos(scraped_teams)
+            # All writes for a season are committed together, so a failure
+            # never leaves a partially written season behind
+            logo_ids = {}
+            with self.repository.unit_of_work() as repository:
+                season = repository.get_or_create_season(season)
+                if scraped_teams:
+                    logo_ids = self._add_teams(
+                        repository, competition, scraped_teams, logo_hashes
+                    )
+            self._logo_ids.update(logo_ids)
+            self.logo_downloader.discard(logo_ids)
+            for stage in pending_stages:
+                self.manifest.mark_complete(competition.name, season, stage)
 
     def process_competitions(
         self,
@@ -59,19 +161,12 @@ class FootballDataManager:
             )
 
 
-url_object = URL.create(
-    drivername='mysql+mysqlconnector',
-    username='footymanager',
-    password='?Ch0bbyF00ty',
-    host='localhost',
-    port=3306,
-    database='pyfooty',
-)
-database = Database(url_object)
-data_manager = FootballDataManager(
-    scraper=FootballScraper(),
-    repository=FootballRepository(session_factory=database.session),
-)
-data_manager.process_competitions(
-    ['premier_league', 'bundesliga', 'championship', 'la_liga'], 2020
-)
+if __name__ == '__main__':
+    database = Database()
+    data_manager = FootballDataManager(
+        scraper=FootballScraper(),
+        repository=FootballRepository(session_factory=database.session),
+    )
+    data_manager.process_competitions(
+        ['premier_league', 'bundesliga', 'championship', 'la_liga'], 2020
+    )
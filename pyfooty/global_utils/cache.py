@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import wraps
+import sys
+import threading
+import time
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+from attrs import define, evolve
+
+KT = TypeVar('KT', bound=Hashable)
+VT = TypeVar('VT')
+
+_MISSING = object()
+
+
+@define
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+class LRUCache(Generic[KT, VT]):
+    __slots__ = ('max_bytes', 'ttl', 'sizeof', '_entries', '_stats', '_lock')
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[VT], int] = sys.getsizeof,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        # Maps key to (value, size, expiry), ordered least to most recent
+        self._entries: OrderedDict[
+            KT, tuple[VT, int, Optional[float]]
+        ] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: KT) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return evolve(self._stats)
+
+    def _remove(self, key: KT) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._stats.size -= size
+        self._stats.entries -= 1
+
+    def get(self, key: KT, default: Any = None) -> VT | Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: KT, value: VT) -> None:
+        size = self.sizeof(value)
+        expires_at = (
+            time.monotonic() + self.ttl if self.ttl is not None else None
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Entries larger than the whole budget are never stored
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, expires_at)
+            self._stats.size += size
+            self._stats.entries += 1
+            while self._stats.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.size = 0
+            self._stats.entries = 0
+
+
+def bounded_cache(
+    max_bytes: int,
+    *,
+    ttl: Optional[float] = None,
+    sizeof: Callable[[Any], int] = sys.getsizeof,
+) -> Callable[[Callable[..., VT]], Callable[..., VT]]:
+    def decorator(func: Callable[..., VT]) -> Callable[..., VT]:
+        lru_cache: LRUCache[Hashable, VT] = LRUCache(
+            max_bytes, ttl=ttl, sizeof=sizeof
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> VT:
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            value = lru_cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                lru_cache.set(key, value)
+            return value
+
+        wrapper.cache = lru_cache
+        wrapper.cache_info = lambda: lru_cache.stats
+        wrapper.cache_clear = lru_cache.clear
+        return wrapper
+
+    return decorator
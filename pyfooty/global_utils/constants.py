@@ -1,2 +1,85 @@
+import os
+from pathlib import Path
+
 BASE_DATA_URL = 'https://fbref.com'
 VALID_COUNTRIES = ('england', 'spain', 'germany', 'italy', 'france')
+
+CACHE_DIR = Path(
+    os.environ.get('PYFOOTY_CACHE_DIR', Path.home() / '.cache' / 'pyfooty')
+)
+RESPONSE_CACHE_TTL = float(os.environ.get('PYFOOTY_RESPONSE_CACHE_TTL', 86_400))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.environ.get('PYFOOTY_RESPONSE_CACHE_MAX_BYTES', 512 * 1024**2)
+)
+
+HTTP_TIMEOUT = (
+    float(os.environ.get('PYFOOTY_HTTP_CONNECT_TIMEOUT', 5)),
+    float(os.environ.get('PYFOOTY_HTTP_READ_TIMEOUT', 30)),
+)
+HTTP_MAX_RETRIES = int(os.environ.get('PYFOOTY_HTTP_MAX_RETRIES', 5))
+HTTP_BACKOFF_FACTOR = float(os.environ.get('PYFOOTY_HTTP_BACKOFF_FACTOR', 1))
+HTTP_MAX_BACKOFF = float(os.environ.get('PYFOOTY_HTTP_MAX_BACKOFF', 60))
+# fbref rate limits clients making more than ~10 requests per minute
+HTTP_RATE_LIMIT = float(os.environ.get('PYFOOTY_HTTP_RATE_LIMIT', 10 / 60))
+HTTP_BURST = float(os.environ.get('PYFOOTY_HTTP_BURST', 1))
+HTTP_POOL_MAXSIZE = int(os.environ.get('PYFOOTY_HTTP_POOL_MAXSIZE', 10))
+
+SCRAPER_MAX_CONCURRENCY = int(
+    os.environ.get('PYFOOTY_SCRAPER_MAX_CONCURRENCY', 16)
+)
+SCRAPER_MAX_HOST_CONCURRENCY = int(
+    os.environ.get('PYFOOTY_SCRAPER_MAX_HOST_CONCURRENCY', 4)
+)
+
+PAGE_CACHE_MAX_BYTES = int(
+    os.environ.get('PYFOOTY_PAGE_CACHE_MAX_BYTES', 256 * 1024**2)
+)
+PAGE_CACHE_TTL = (
+    float(os.environ['PYFOOTY_PAGE_CACHE_TTL'])
+    if 'PYFOOTY_PAGE_CACHE_TTL' in os.environ
+    else None
+)
+URL_CACHE_MAX_BYTES = int(
+    os.environ.get('PYFOOTY_URL_CACHE_MAX_BYTES', 4 * 1024**2)
+)
+
+# One of: live, record, replay
+SCRAPING_MODE = os.environ.get('PYFOOTY_SCRAPING_MODE', 'live')
+CORPUS_DIR = Path(
+    os.environ.get('PYFOOTY_CORPUS_DIR', CACHE_DIR / 'corpus')
+)
+
+INGEST_MANIFEST_PATH = Path(
+    os.environ.get(
+        'PYFOOTY_INGEST_MANIFEST_PATH', CACHE_DIR / 'ingest_manifest.json'
+    )
+)
+
+URL_STORE_PATH = Path(
+    os.environ.get('PYFOOTY_URL_STORE_PATH', CACHE_DIR / 'urls.json')
+)
+
+LOGO_DOWNLOAD_MAX_WORKERS = int(
+    os.environ.get('PYFOOTY_LOGO_DOWNLOAD_MAX_WORKERS', 8)
+)
+
+DB_FLUSH_BATCH_SIZE = int(os.environ.get('PYFOOTY_DB_FLUSH_BATCH_SIZE', 500))
+
+DATABASE_URL = os.environ.get(
+    'PYFOOTY_DATABASE_URL',
+    'mysql+mysqlconnector://footymanager@localhost:3306/pyfooty',
+)
+DATABASE_PASSWORD = os.environ.get('PYFOOTY_DATABASE_PASSWORD')
+DB_POOL_SIZE = int(os.environ.get('PYFOOTY_DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('PYFOOTY_DB_MAX_OVERFLOW', 10))
+DB_POOL_PRE_PING = os.environ.get('PYFOOTY_DB_POOL_PRE_PING', '1') == '1'
+# MySQL closes idle connections after 8 hours by default
+DB_POOL_RECYCLE = int(os.environ.get('PYFOOTY_DB_POOL_RECYCLE', 3_600))
+DB_QUERY_CACHE_SIZE = int(os.environ.get('PYFOOTY_DB_QUERY_CACHE_SIZE', 500))
+DB_STREAM_CHUNK_SIZE = int(
+    os.environ.get('PYFOOTY_DB_STREAM_CHUNK_SIZE', 1_000)
+)
+# Off by default as it lets the server read files from the client
+DB_ALLOW_LOCAL_INFILE = (
+    os.environ.get('PYFOOTY_DB_ALLOW_LOCAL_INFILE', '0') == '1'
+)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from enum import StrEnum, auto
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Optional
+
+from entities.season import Season
+from global_utils import constants
+
+ManifestKey = tuple[str, str, str]
+
+
+class IngestStage(StrEnum):
+    TEAMS = auto()
+
+
+class IngestManifest:
+    def __init__(self, path: Path | str = constants.INGEST_MANIFEST_PATH):
+        self.path = Path(path)
+        self._completed: set[ManifestKey] = set()
+        if self.path.exists():
+            with open(self.path, 'r') as file:
+                self._completed = {tuple(key) for key in json.load(file)}
+
+    @staticmethod
+    def _key(
+        competition_name: str, season: Season, stage: IngestStage
+    ) -> ManifestKey:
+        return competition_name, str(season), str(stage)
+
+    def is_complete(
+        self, competition_name: str, season: Season, stage: IngestStage
+    ) -> bool:
+        return self._key(competition_name, season, stage) in self._completed
+
+    def pending_stages(
+        self, competition_name: str, season: Season
+    ) -> list[IngestStage]:
+        return [
+            stage
+            for stage in IngestStage
+            if not self.is_complete(competition_name, season, stage)
+        ]
+
+    def mark_complete(
+        self, competition_name: str, season: Season, stage: IngestStage
+    ) -> None:
+        self._completed.add(self._key(competition_name, season, stage))
+        self._save()
+
+    def reset(
+        self,
+        competition_name: Optional[str] = None,
+        season: Optional[Season] = None,
+    ) -> None:
+        self._completed = {
+            key
+            for key in self._completed
+            if (competition_name is not None and key[0] != competition_name)
+            or (season is not None and key[1] != str(season))
+        }
+        self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash mid-write never
+        # corrupts the existing manifest
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(sorted(self._completed), file, indent=2)
+        os.replace(tmp_path, self.path)
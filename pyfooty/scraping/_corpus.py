@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraping._exceptions import ResponseNotRecordedError
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+class ResponseCorpus:
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (
+            self.directory / f'{key}.json',
+            self.directory / f'{key}.bin',
+        )
+
+    def __contains__(self, url: str) -> bool:
+        return self._paths(url)[0].exists()
+
+    def record(self, url: str, response: requests.Response) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, content_path = self._paths(url)
+        # Content is written first so a metadata file always has its body
+        _write_atomic(content_path, response.content)
+        _write_atomic(
+            meta_path,
+            json.dumps(
+                {
+                    'url': url,
+                    'status_code': response.status_code,
+                    'headers': dict(response.headers),
+                    'encoding': response.encoding,
+                }
+            ).encode('utf-8'),
+        )
+
+    def replay(self, url: str) -> requests.Response:
+        meta_path, content_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            content = content_path.read_bytes()
+        except FileNotFoundError:
+            raise ResponseNotRecordedError(url)
+
+        response = requests.Response()
+        response.url = meta['url']
+        response.status_code = meta['status_code']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta['encoding']
+        response._content = content
+        return response
@@ -31,3 +31,8 @@ class CompetitionNotSupportedError(Exception):
             f'Data for competition: {competition_name} unavailable'
             'as it is not currently supported.'
         )
+
+
+class ResponseNotRecordedError(Exception):
+    def __init__(self, url: str) -> None:
+        super().__init__(f'No recorded response found for url: {url}.')
@@ -1,16 +1,28 @@
 from functools import cache, partial
+import json
+import os
 import re
+import sys
+import tempfile
 from typing import Optional
 
-from bs4 import BeautifulSoup
-import requests
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
 
 from global_utils import constants
+from global_utils.cache import CacheStats, bounded_cache
 from scraping._exceptions import (
     SoupNotFoundError,
     TagNotFoundError,
     UrlNotFoundError,
 )
+from scraping._response_cache import CachedResponse, ResponseCache
+from scraping._session import get_fetch_session
+
+_RESPONSE_CACHE = ResponseCache(
+    constants.CACHE_DIR / 'responses',
+    ttl=constants.RESPONSE_CACHE_TTL,
+    max_bytes=constants.RESPONSE_CACHE_MAX_BYTES,
+)
 
 
 def _split_on_dash_or_endash(string: str) -> list:
@@ -18,10 +30,71 @@ def _split_on_dash_or_endash(string: str) -> list:
     return re.split(pattern, string)
 
 
-@cache
-def _get_soup(url: str) -> BeautifulSoup:
-    response = requests.get(url)
-    return BeautifulSoup(response.text, 'html.parser')
+# Rough per-node overhead of a bs4 Tag, including its attrs dict and the
+# parent/sibling links
+_TAG_SIZE = 1_000
+
+
+def _estimate_soup_size(soup: BeautifulSoup) -> int:
+    size = _TAG_SIZE
+    for element in soup.descendants:
+        if isinstance(element, NavigableString):
+            size += sys.getsizeof(element)
+        else:
+            size += _TAG_SIZE
+    return size
+
+
+def _get_html(url: str) -> str:
+    session = get_fetch_session()
+    if session.bypass_cache:
+        response = session.get(url)
+        response.raise_for_status()
+        return response.text
+
+    cached = _RESPONSE_CACHE.get(url)
+    if cached is not None and cached.is_fresh(_RESPONSE_CACHE.ttl):
+        return cached.text
+
+    headers = cached.revalidation_headers() if cached is not None else {}
+    response = session.get(url, headers=headers)
+    if cached is not None and response.status_code == 304:
+        _RESPONSE_CACHE.touch(url)
+        return cached.text
+    response.raise_for_status()
+
+    _RESPONSE_CACHE.set(CachedResponse.from_response(response), url)
+    return response.text
+
+
+@bounded_cache(
+    constants.PAGE_CACHE_MAX_BYTES,
+    ttl=constants.PAGE_CACHE_TTL,
+    sizeof=_estimate_soup_size,
+)
+def _get_soup(
+    url: str,
+    tag_name: Optional[str] = None,
+    tag_id: Optional[str | re.Pattern] = None,
+) -> BeautifulSoup:
+    if tag_name is None and tag_id is None:
+        return BeautifulSoup(_get_html(url), 'html.parser')
+    # Only build the tree for the requested elements, lxml is the only
+    # parser which is both fast and supports parse_only
+    parse_only = (
+        SoupStrainer(tag_name, id=tag_id)
+        if tag_id is not None
+        else SoupStrainer(tag_name)
+    )
+    return BeautifulSoup(_get_html(url), 'lxml', parse_only=parse_only)
+
+
+def _get_table(url: str, table_id: str | re.Pattern) -> Optional[Tag]:
+    return _get_soup(url, 'table', table_id).find('table', id=table_id)
+
+
+def _get_anchors_soup(url: str) -> BeautifulSoup:
+    return _get_soup(url, 'a')
 
 
 def _find_rel_url(soup: BeautifulSoup, page_string: str | re.Pattern) -> str:
@@ -33,7 +106,7 @@ def _find_rel_url(soup: BeautifulSoup, page_string: str | re.Pattern) -> str:
     return anchor_tag.get('href')
 
 
-@cache
+@bounded_cache(constants.URL_CACHE_MAX_BYTES, ttl=constants.PAGE_CACHE_TTL)
 def _find_url(
     parent_url: str,
     page_string: str | re.Pattern,
@@ -42,19 +115,72 @@ def _find_url(
     base_url: Optional[str] = None,
 ) -> str:
     base_url = parent_url if not base_url else base_url
-    soup = _get_soup(parent_url)
 
     try:
         if table_id is not None:
-            table = soup.find('table', id=table_id)
+            table = _get_table(parent_url, table_id)
             rel_url = _find_rel_url(table, page_string)
         else:
-            rel_url = _find_rel_url(soup, page_string)
+            rel_url = _find_rel_url(_get_anchors_soup(parent_url), page_string)
     except (SoupNotFoundError, TagNotFoundError):
-        response = requests.get(parent_url)
-        response.raise_for_status()
         raise UrlNotFoundError(parent_url, page_string)
     return base_url + rel_url
 
 
 _find_url_from_base = partial(_find_url, base_url=constants.BASE_DATA_URL)
+
+
+def _load_url_store() -> dict[str, str]:
+    try:
+        with open(constants.URL_STORE_PATH, 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_url_store(url_store: dict[str, str]) -> None:
+    constants.URL_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=constants.URL_STORE_PATH.parent, suffix='.tmp'
+    )
+    with os.fdopen(fd, 'w') as file:
+        json.dump(url_store, file, indent=2)
+    os.replace(tmp_path, constants.URL_STORE_PATH)
+
+
+@cache
+def _find_persisted_url_from_base(parent_url: str, page_string: str) -> str:
+    # Used for urls which are effectively static, so they are resolved at
+    # most once per machine rather than once per process
+    if get_fetch_session().bypass_cache:
+        return _find_url_from_base(
+            parent_url=parent_url, page_string=page_string
+        )
+
+    key = f'{parent_url} {page_string}'
+    url_store = _load_url_store()
+    url = url_store.get(key)
+    if url is None:
+        url = _find_url_from_base(
+            parent_url=parent_url, page_string=page_string
+        )
+        url_store[key] = url
+        _save_url_store(url_store)
+    return url
+
+
+def get_competitions_url() -> str:
+    return _find_persisted_url_from_base(
+        parent_url=constants.BASE_DATA_URL, page_string='Competitions'
+    )
+
+
+def get_page_cache_stats() -> dict[str, CacheStats]:
+    return {
+        'soup': _get_soup.cache_info(),
+        'url': _find_url.cache_info(),
+    }
+
+
+def clear_page_cache() -> None:
+    _get_soup.cache_clear()
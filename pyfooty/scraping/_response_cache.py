@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Optional
+
+from attrs import define, field
+import requests
+
+
+@define
+class CachedResponse:
+    url: str
+    text: str
+    etag: Optional[str] = field(default=None)
+    last_modified: Optional[str] = field(default=None)
+    fetched_at: float = field(factory=time.time)
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> CachedResponse:
+        return cls(
+            url=response.url,
+            text=response.text,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def revalidation_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(
+        self, directory: Path | str, *, ttl: float, max_bytes: int
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.directory / f'{key}.json'
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob('*.json'))
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self._entries())
+        return self._size
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Bump the access time so eviction is least recently used
+        os.utime(path)
+        return CachedResponse(**data)
+
+    def set(self, response: CachedResponse, url: Optional[str] = None) -> None:
+        path = self._path(url if url is not None else response.url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Taken before writing, as a first lazy scan would otherwise count
+        # the new entry and then have it added again below
+        size = self.size
+        old_size = path.stat().st_size if path.exists() else 0
+
+        # Write to a temporary file first so concurrent readers never see a
+        # partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'url': response.url,
+                    'text': response.text,
+                    'etag': response.etag,
+                    'last_modified': response.last_modified,
+                    'fetched_at': response.fetched_at,
+                },
+                file,
+            )
+        os.replace(tmp_path, path)
+
+        self._size = size - old_size + path.stat().st_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def touch(self, url: str) -> Optional[CachedResponse]:
+        response = self.get(url)
+        if response is None:
+            return None
+        response.fetched_at = time.time()
+        self.set(response, url)
+        return response
+
+    def evict(self, max_bytes: Optional[int] = None) -> None:
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        self.evict(max_bytes=0)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Literal, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from global_utils import constants
+from scraping._corpus import ResponseCorpus
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+ScrapingMode = Literal['live', 'record', 'replay']
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchSession:
+    def __init__(
+        self,
+        *,
+        timeout: tuple[float, float] = constants.HTTP_TIMEOUT,
+        max_retries: int = constants.HTTP_MAX_RETRIES,
+        backoff_factor: float = constants.HTTP_BACKOFF_FACTOR,
+        max_backoff: float = constants.HTTP_MAX_BACKOFF,
+        rate_limit: float = constants.HTTP_RATE_LIMIT,
+        burst: float = constants.HTTP_BURST,
+        pool_maxsize: int = constants.HTTP_POOL_MAXSIZE,
+        mode: ScrapingMode = constants.SCRAPING_MODE,
+        corpus: Optional[ResponseCorpus] = None,
+    ) -> None:
+        if mode not in ('live', 'record', 'replay'):
+            raise ValueError(f'Invalid scraping mode: {mode}.')
+        self.mode = mode
+        self.corpus = (
+            corpus
+            if corpus is not None
+            else ResponseCorpus(constants.CORPUS_DIR)
+        )
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self.burst = burst
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_limit, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _backoff(
+        self, attempt: int, response: Optional[requests.Response]
+    ) -> float:
+        retry_after = (
+            response.headers.get('Retry-After')
+            if response is not None
+            else None
+        )
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        # Exponential backoff with full jitter
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+
+    @property
+    def bypass_cache(self) -> bool:
+        # Recording must see every response and replaying must only ever
+        # serve the corpus, so neither should be short-circuited by caches
+        return self.mode != 'live'
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        if self.mode == 'replay':
+            return self.corpus.replay(url)
+        response = self._get(url, **kwargs)
+        if self.mode == 'record' and response.ok:
+            self.corpus.record(url, response)
+        return response
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self._session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                response = None
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    return response
+            time.sleep(self._backoff(attempt, response))
+        return response
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_FETCH_SESSION: Optional[FetchSession] = None
+_FETCH_SESSION_LOCK = threading.Lock()
+
+
+def get_fetch_session() -> FetchSession:
+    global _FETCH_SESSION
+    with _FETCH_SESSION_LOCK:
+        if _FETCH_SESSION is None:
+            _FETCH_SESSION = FetchSession()
+        return _FETCH_SESSION
+
+
+def set_fetch_session(session: FetchSession) -> None:
+    global _FETCH_SESSION
+    with _FETCH_SESSION_LOCK:
+        _FETCH_SESSION = session
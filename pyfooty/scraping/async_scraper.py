@@ -0,0 +1,170 @@
+import asyncio
+from collections import defaultdict
+import logging
+import re
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from entities.competition import Competition, get_competition_dict
+from entities.season import Season, season_range
+from global_utils import constants
+from scraping._exceptions import UrlNotFoundError
+from scraping._local_utils import (
+    _find_url_from_base,
+    _get_soup,
+    _get_table,
+    get_competitions_url,
+)
+from scraping.scraper import (
+    RESULTS_TABLE_ID,
+    SEASONS_TABLE_ID,
+    FootballScraper,
+    ScrapedTeam,
+    ScrapingLocation,
+    _parse_team_page,
+    _parse_team_urls,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFootballScraper(FootballScraper):
+    def __init__(
+        self,
+        *,
+        location: ScrapingLocation = 'england',
+        max_concurrency: int = constants.SCRAPER_MAX_CONCURRENCY,
+        max_host_concurrency: int = constants.SCRAPER_MAX_HOST_CONCURRENCY,
+    ) -> None:
+        super().__init__(location=location)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: defaultdict[
+            str, asyncio.Semaphore
+        ] = defaultdict(lambda: asyncio.Semaphore(max_host_concurrency))
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+
+    async def _run_limited(
+        self, url: str, func: Callable[..., Any], /, *args, **kwargs
+    ) -> Any:
+        # The fetch layer is blocking, so each call is run in a worker thread
+        # while holding both the global and the per-host concurrency limits
+        host = urlsplit(url).netloc
+        async with self._semaphore, self._host_semaphores[host]:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def _fetch(
+        self, url: str, func: Callable[..., Any], /, *args, **kwargs
+    ) -> Any:
+        # Identical calls made while one is in flight would all miss the
+        # caches together, so they share its result instead
+        key = (func, args, tuple(sorted(kwargs.items())))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._run_limited(url, func, *args, **kwargs)
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded, so one caller being cancelled does not fail the others
+        return await asyncio.shield(task)
+
+    async def process_team(self, team_url: str) -> ScrapedTeam:
+        team_data_url = await self._fetch(
+            team_url,
+            _find_url_from_base,
+            parent_url=team_url,
+            page_string=re.compile(r'Stats & History$'),
+        )
+        team_data_soup = await self._fetch(
+            team_data_url, _get_soup, team_data_url
+        )
+        logo_url, name = _parse_team_page(team_data_soup)
+        return ScrapedTeam(url=team_data_url, name=name, logo_url=logo_url)
+
+    async def process_teams(self, season_url: str) -> list[ScrapedTeam]:
+        team_table = await self._fetch(
+            season_url, _get_table, season_url, RESULTS_TABLE_ID
+        )
+        return list(
+            await asyncio.gather(
+                *(
+                    self.process_team(team_url)
+                    for team_url in _parse_team_urls(team_table)
+                )
+            )
+        )
+
+    async def process_season(
+        self, season: Season, competition: Competition, competition_url: str
+    ) -> Optional[list[ScrapedTeam]]:
+        try:
+            season_url = await self._fetch(
+                competition_url,
+                _find_url_from_base,
+                parent_url=competition_url,
+                page_string=str(season),
+                table_id=SEASONS_TABLE_ID,
+            )
+        except UrlNotFoundError:
+            logger.warning(
+                f'No data available for {season} {competition.name} season.'
+            )
+            return
+        return await self.process_teams(season_url)
+
+    async def process_competition(
+        self,
+        competition: Competition,
+        from_season: Season | str | int,
+        to_season: Season | str | int = Season(),
+    ) -> dict[Season, list[ScrapedTeam]]:
+        competitions_url = await self._fetch(
+            constants.BASE_DATA_URL, get_competitions_url
+        )
+        competition_url = await self._fetch(
+            competitions_url,
+            _find_url_from_base,
+            parent_url=competitions_url,
+            page_string=competition.alt_name,
+        )
+        # Every season is found in the same seasons table, so it is read
+        # once here rather than by each season at the same time
+        await self._fetch(
+            competition_url, _get_table, competition_url, SEASONS_TABLE_ID
+        )
+        seasons = list(
+            season_range(from_season, to_season, inclusive='both')
+        )
+        results = await asyncio.gather(
+            *(
+                self.process_season(season, competition, competition_url)
+                for season in seasons
+            )
+        )
+        return {
+            season: teams
+            for season, teams in zip(seasons, results)
+            if teams is not None
+        }
+
+    async def scrape_data(
+        self,
+        competition_names: Iterable[str],
+        from_season: Season | str | int,
+        to_season: Season | str | int = Season(),
+    ) -> dict[str, dict[Season, list[ScrapedTeam]]]:
+        competition_dict = get_competition_dict()
+        competitions = {}
+        for competition_name in competition_names:
+            competition = competition_dict.get(competition_name)
+            if competition is None:
+                logger.warning(f'Invalid competition: {competition_name}')
+                continue
+            competitions[competition_name] = competition
+        results = await asyncio.gather(
+            *(
+                self.process_competition(competition, from_season, to_season)
+                for competition in competitions.values()
+            )
+        )
+        return dict(zip(competitions, results))
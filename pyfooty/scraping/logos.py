@@ -0,0 +1,74 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import threading
+
+import requests
+
+from global_utils import constants
+from scraping._session import get_fetch_session
+
+logger = logging.getLogger(__name__)
+
+
+def _download(url: str) -> bytes:
+    response = get_fetch_session().get(url)
+    response.raise_for_status()
+    return response.content
+
+
+def get_content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class LogoDownloader:
+    def __init__(
+        self, *, max_workers: int = constants.LOGO_DOWNLOAD_MAX_WORKERS
+    ) -> None:
+        self.max_workers = max_workers
+        # Urls map to content hashes and blobs are stored once per hash, so
+        # the same image served from several urls is only kept once
+        self._hashes: dict[str, str] = {}
+        self._blobs: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, url: str) -> None:
+        try:
+            data = _download(url)
+        except requests.RequestException as error:
+            # Left unhashed, so the download is retried on the next run
+            logger.warning(f'Failed to download logo: {url}, {error}')
+            return
+        content_hash = get_content_hash(data)
+        with self._lock:
+            self._hashes[url] = content_hash
+            self._blobs.setdefault(content_hash, data)
+
+    def download(self, urls: Iterable[str]) -> dict[str, str]:
+        urls = list(dict.fromkeys(urls))
+        with self._lock:
+            pending = [url for url in urls if url not in self._hashes]
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Consume the results so unexpected errors are raised here
+                list(executor.map(self._fetch, pending))
+        with self._lock:
+            return {
+                url: self._hashes[url] for url in urls if url in self._hashes
+            }
+
+    def get_blobs(self, content_hashes: Iterable[str]) -> dict[str, bytes]:
+        with self._lock:
+            return {
+                content_hash: self._blobs[content_hash]
+                for content_hash in content_hashes
+                if content_hash in self._blobs
+            }
+
+    def discard(self, content_hashes: Iterable[str]) -> None:
+        # Only once the blobs are committed, as until then a rolled back
+        # unit of work may need them again
+        with self._lock:
+            for content_hash in content_hashes:
+                self._blobs.pop(content_hash, None)
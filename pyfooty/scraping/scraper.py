@@ -1,7 +1,10 @@
 import logging
 import re
-from typing import Iterable, Literal
-import requests
+from typing import Iterable, Literal, Optional
+
+from attrs import frozen
+from bs4 import BeautifulSoup, Tag
+
 from entities.competition import (
     Competition,
     CompetitionUrlInfo,
@@ -9,9 +12,16 @@ from entities.competition import (
 )
 
 from entities.season import Season, season_range
+from entities.team import Team
 
 from global_utils import constants
-from scraping._local_utils import _get_soup, _find_url_from_base
+from scraping._local_utils import (
+    _find_url_from_base,
+    _get_soup,
+    _get_table,
+    clear_page_cache,
+    get_competitions_url,
+)
 from scraping._exceptions import UrlNotFoundError, CompetitionNotSupportedError
 
 logger = logging.getLogger(__name__)
@@ -25,6 +35,48 @@ def _has_team_name(tag):
     return tag.name == 'p' and tag.strong and 'Team Name' in tag.get_text()
 
 
+@frozen
+class ScrapedTeam:
+    url: str
+    name: Optional[str]
+    logo_url: Optional[str]
+
+    def to_team(
+        self, competition: Competition, logo_id: Optional[int] = None
+    ) -> Team:
+        # Teams share the gender, country and type of their competition
+        return Team(
+            name=self.name,
+            gender=competition.gender,
+            country=competition.country,
+            type=competition.team_type,
+            logo_id=logo_id,
+        )
+
+
+RESULTS_TABLE_ID = re.compile(r'^results')
+SEASONS_TABLE_ID = 'seasons'
+
+
+def _parse_team_urls(team_table: Tag) -> list[str]:
+    return [
+        constants.BASE_DATA_URL + team.a.get('href')
+        for team in team_table.find_all('td', attrs={'data-stat': 'team'})
+    ]
+
+
+def _parse_team_page(soup: BeautifulSoup) -> tuple[str, Optional[str]]:
+    logo_image = soup.find('img', class_='teamlogo')
+    data_div = logo_image.parent.next_sibling
+    p_tag = data_div.find(_has_team_name)
+    name = (
+        p_tag.get_text().split(':', 1)[-1].strip()
+        if p_tag is not None
+        else None
+    )
+    return logo_image.get('src'), name
+
+
 class FootballScraper:
     LOCATION_URL_EXTENSION_DICT = {
         'england': 'en',
@@ -34,80 +86,83 @@ class FootballScraper:
         'portugal': 'pt',
         'spain': 'es',
     }
-    COMPETITION_DICT = get_competition_dict()
-    _COMPETITIONS_URL = _find_url_from_base(
-        parent_url=constants.BASE_DATA_URL, page_string='Competitions'
-    )
 
     def __init__(self, *, location: ScrapingLocation = 'england') -> None:
         self.location_url = self.LOCATION_URL_EXTENSION_DICT.get(location)
         if self.location_url is None:
             raise ValueError(f'Invalid location: {location}.')
 
-    def process_team(self, team_url: str):
+    def process_team(self, team_url: str) -> ScrapedTeam:
         team_data_url = _find_url_from_base(
             parent_url=team_url,
             page_string=re.compile(r'Stats & History$'),
         )
         team_data_soup = _get_soup(team_data_url)
-        logo_image = team_data_soup.find('img', class_='teamlogo')
-        logo_data = requests.get(logo_image.get('src')).content
-        data_div = logo_image.parent.next_sibling
-        p_tag = data_div.find(_has_team_name)
-
-    def process_teams(self, season_url: str):
-        soup = _get_soup(season_url)
-        team_table = soup.find('table', id=re.compile(r'^results'))
-        for team in team_table.find_all('td', attrs={'data-stat': 'team'})[:1]:
-            team_url = constants.BASE_DATA_URL + team.a.get('href')
+        logo_url, name = _parse_team_page(team_data_soup)
+        return ScrapedTeam(url=team_data_url, name=name, logo_url=logo_url)
+
+    def process_teams(self, season_url: str) -> list[ScrapedTeam]:
+        team_table = _get_table(season_url, RESULTS_TABLE_ID)
+        return [
             self.process_team(team_url)
+            for team_url in _parse_team_urls(team_table)
+        ]
 
-    def process_season(self, season: Season, competition_url: str):
-        self.population.season = season
+    def process_season(
+        self, season: Season, competition: Competition, competition_url: str
+    ) -> Optional[list[ScrapedTeam]]:
         try:
             season_url = _find_url_from_base(
                 parent_url=competition_url,
                 page_string=str(season),
-                table_id='seasons',
+                table_id=SEASONS_TABLE_ID,
             )
         except UrlNotFoundError:
             logger.warning(
-                f'No data available for '
-                f'{season} {self.population.competition.name} season.'
+                f'No data available for {season} {competition.name} season.'
             )
             return
-        self.process_teams(season_url)
+        return self.process_teams(season_url)
 
     def process_competition(
         self,
         competition: Competition,
         from_season: Season | str | int,
         to_season: Season | str | int = Season(),
-    ):
-        self.population.competition = competition
+    ) -> dict[Season, list[ScrapedTeam]]:
         competition_url = _find_url_from_base(
-            parent_url=self._COMPETITIONS_URL,
+            parent_url=get_competitions_url(),
             page_string=competition.alt_name,
         )
+        seasons = {}
         for season in season_range(from_season, to_season, inclusive='both'):
-            self.process_season(season, competition_url)
+            teams = self.process_season(season, competition, competition_url)
+            if teams is not None:
+                seasons[season] = teams
+        return seasons
 
     def scrape_data(
         self,
         competition_names: Iterable[str],
         from_season: Season | str | int,
         to_season: Season | str | int = Season(),
-    ):
+    ) -> dict[str, dict[Season, list[ScrapedTeam]]]:
         competition_dict = get_competition_dict()
+        competitions = {}
         for competition_name in competition_names:
             competition = competition_dict.get(competition_name)
             if competition is None:
                 logger.warning(f'Invalid competition: {competition_name}')
                 continue
-            self.process_competition(competition, from_season, to_season)
+            competitions[competition_name] = self.process_competition(
+                competition, from_season, to_season
+            )
+            # Parsed pages are rarely shared between competitions
+            clear_page_cache()
+        return competitions
 
     def scrape_competition(self, competition_name: str) -> Competition:
-        competition = self.COMPETITION_DICT.get(competition_name)
+        competition = get_competition_dict().get(competition_name)
         if competition is None:
             raise CompetitionNotSupportedError(competition_name)
         return competition
@@ -125,8 +180,9 @@ class FootballScraper:
 
     def scrape_teams(
         self, competition_name: str, season: Season | str | int = Season()
-    ) -> list[Team]:
+    ) -> list[ScrapedTeam]:
         competition = self.scrape_competition(competition_name)
         season_url = self._get_season_url(
             competition_url_info=competition.url_info, season=season
         )
+        return self.process_teams(season_url)
@@ -0,0 +1,99 @@
+from collections.abc import Mapping
+from typing import Any, Literal, Optional
+
+import lxml.html
+import pandas as pd
+
+from scraping._exceptions import TagNotFoundError
+from scraping._local_utils import _get_html
+
+ColumnNames = Literal['data-stat', 'header']
+
+# Rows fbref repeats inside long tables to break them up visually
+_SKIPPED_ROW_CLASSES = frozenset(
+    {'thead', 'over_header', 'spacer', 'partial_table'}
+)
+
+
+def _find_table(root: lxml.html.HtmlElement, table_id: str):
+    tables = root.xpath('//table[@id=$table_id]', table_id=table_id)
+    if tables:
+        return tables[0]
+    # fbref ships most of its secondary stats tables commented out and
+    # un-comments them client side
+    for comment in root.xpath('//comment()'):
+        if comment.text is None or table_id not in comment.text:
+            continue
+        tables = lxml.html.fromstring(comment.text).xpath(
+            '//table[@id=$table_id]', table_id=table_id
+        )
+        if tables:
+            return tables[0]
+    raise TagNotFoundError('table', attrs={'id': table_id})
+
+
+def _is_skipped_row(row: lxml.html.HtmlElement) -> bool:
+    return not _SKIPPED_ROW_CLASSES.isdisjoint(row.classes)
+
+
+def _to_typed_column(values: list[str]) -> pd.Series:
+    column = pd.Series(values, dtype='string').str.strip().replace('', pd.NA)
+    numeric = pd.to_numeric(column.str.replace(',', ''), errors='coerce')
+    # Only convert if every non empty value was numeric
+    if numeric.notna().sum() == column.notna().sum():
+        return numeric
+    return column
+
+
+def read_table(
+    html: str,
+    table_id: str,
+    *,
+    columns: ColumnNames = 'data-stat',
+    dtypes: Optional[Mapping[str, Any]] = None,
+) -> pd.DataFrame:
+    table = _find_table(lxml.html.fromstring(html), table_id)
+
+    header_rows = table.xpath('./thead/tr')
+    headers = (
+        [cell.text_content().strip() for cell in header_rows[-1]]
+        if header_rows
+        else []
+    )
+
+    data: dict[str, list[str]] = {}
+    body_rows = table.xpath('./tbody/tr') or table.xpath('./tr')
+    for row_number, row in enumerate(
+        row for row in body_rows if not _is_skipped_row(row)
+    ):
+        for position, cell in enumerate(row):
+            if columns == 'data-stat':
+                name = cell.get('data-stat')
+            else:
+                name = headers[position] if position < len(headers) else None
+            if name is None:
+                continue
+            values = data.setdefault(name, [''] * row_number)
+            if len(values) == row_number:
+                values.append(cell.text_content())
+        # Pad columns missing from this row so all columns stay aligned
+        for values in data.values():
+            if len(values) == row_number:
+                values.append('')
+
+    df = pd.DataFrame(
+        {name: _to_typed_column(values) for name, values in data.items()}
+    )
+    if dtypes is not None:
+        df = df.astype(dtypes)
+    return df
+
+
+def get_table(
+    url: str,
+    table_id: str,
+    *,
+    columns: ColumnNames = 'data-stat',
+    dtypes: Optional[Mapping[str, Any]] = None,
+) -> pd.DataFrame:
+    return read_table(_get_html(url), table_id, columns=columns, dtypes=dtypes)
@@ -1,14 +1,14 @@
-import pandas as pd
-
+from entities.competition import get_competition_dict
 from global_utils import constants
-from scraping._local_utils import _find_url_from_base
+from scraping._local_utils import _find_persisted_url_from_base
+from scraping.tables import get_table
 
 
 def get_countries() -> list[str]:
-    countries_url = _find_url_from_base(
+    countries_url = _find_persisted_url_from_base(
         parent_url=constants.BASE_DATA_URL, page_string='Countries'
     )
-    countries_df = pd.read_html(countries_url, attrs={'id': 'countries'})[0]
+    countries_df = get_table(countries_url, 'countries', columns='header')
     return countries_df.Country.map(lambda x: x.lower()).to_list()
 
 
@@ -17,4 +17,4 @@ def get_valid_countries() -> tuple[str, ...]:
 
 
 def get_valid_competitions() -> tuple[str, ...]:
-    return tuple(constants.COMPETITIONS_DICT.keys())
+    return tuple(get_competition_dict().keys())
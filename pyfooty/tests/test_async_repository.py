@@ -0,0 +1,143 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from sqlalchemy import func, select
+
+from database import async_repository
+from database.async_repository import AsyncFootballRepository
+from database.engine import AsyncDatabase
+from database.enums import Gender, TeamType
+from database.schemas import BaseModel, SeasonModel
+from entities.entity import Entity
+from entities.season import Season
+from entities.team import Team
+
+
+async def _create_database() -> AsyncDatabase:
+    database = AsyncDatabase('sqlite+aiosqlite://')
+    async with database.connection() as connection:
+        await connection.run_sync(BaseModel.metadata.create_all)
+        await connection.commit()
+    return database
+
+
+async def _count_seasons(database: AsyncDatabase) -> int:
+    async with database.session() as session:
+        return await session.scalar(
+            select(func.count()).select_from(SeasonModel)
+        )
+
+
+async def _collect(entities: AsyncIterator[Entity]) -> list[Entity]:
+    return [entity async for entity in entities]
+
+
+def test_concurrent_calls_each_commit():
+    async def run() -> tuple[list[Season], int]:
+        database = await _create_database()
+        repository = AsyncFootballRepository(database.session)
+        seasons = await asyncio.gather(
+            *(repository.add_season(Season(year)) for year in range(2001, 2010))
+        )
+        count = await _count_seasons(database)
+        await database.dispose()
+        return seasons, count
+
+    seasons, count = asyncio.run(run())
+    assert len({season.id for season in seasons}) == 9
+    assert count == 9
+
+
+def test_concurrent_calls_within_unit_of_work():
+    async def run() -> tuple[list[Season], int]:
+        database = await _create_database()
+        repository = AsyncFootballRepository(database.session)
+        async with repository.unit_of_work() as unit_of_work:
+            seasons = await asyncio.gather(
+                *(
+                    unit_of_work.get_or_create_season(Season(year))
+                    for year in (2001, 2002, 2001, 2003)
+                )
+            )
+        count = await _count_seasons(database)
+        await database.dispose()
+        return seasons, count
+
+    seasons, count = asyncio.run(run())
+    assert [season.from_year for season in seasons] == [2001, 2002, 2001, 2003]
+    assert seasons[0].id == seasons[2].id
+    assert count == 3
+
+
+def test_stream_alongside_calls_within_unit_of_work():
+    async def run() -> tuple[list[Entity], list[Team]]:
+        database = await _create_database()
+        repository = AsyncFootballRepository(database.session)
+        await repository.add_season(Season(2001))
+        async with repository.unit_of_work() as unit_of_work:
+            seasons, teams = await asyncio.gather(
+                _collect(unit_of_work.stream_entities(SeasonModel)),
+                unit_of_work.get_or_create_teams(
+                    [
+                        Team(
+                            name='Arsenal',
+                            gender=Gender.MALE,
+                            country='england',
+                            type=TeamType.CLUB,
+                        )
+                    ]
+                ),
+            )
+        await database.dispose()
+        return seasons, teams
+
+    seasons, teams = asyncio.run(run())
+    assert [season.from_year for season in seasons] == [2001]
+    assert teams[0].id is not None
+
+
+def test_stream_sees_staged_models_within_unit_of_work():
+    async def run() -> list[Entity]:
+        database = await _create_database()
+        repository = AsyncFootballRepository(database.session)
+        async with repository.unit_of_work() as unit_of_work:
+            await unit_of_work.add_many(
+                [Season(year) for year in (2001, 2002, 2003)], SeasonModel
+            )
+            seasons = await _collect(unit_of_work.stream_entities(SeasonModel))
+        await database.dispose()
+        return seasons
+
+    seasons = asyncio.run(run())
+    assert [season.from_year for season in seasons] == [2001, 2002, 2003]
+
+
+def test_stream_pages_by_primary_key_without_server_side_cursors(
+    monkeypatch,
+):
+    async def run() -> tuple[list[Entity], list[int]]:
+        database = await _create_database()
+        repository = AsyncFootballRepository(database.session)
+        await repository.add_many(
+            [Season(year) for year in range(2001, 2026)], SeasonModel
+        )
+        seasons = await _collect(
+            repository.stream_entities(SeasonModel, chunk_size=10)
+        )
+        sizes = [
+            len(dataframe)
+            async for dataframe in repository.stream_dataframes(
+                SeasonModel, chunk_size=10
+            )
+        ]
+        await database.dispose()
+        return seasons, sizes
+
+    monkeypatch.setattr(
+        async_repository,
+        '_supports_server_side_cursors',
+        lambda session: False,
+    )
+    seasons, sizes = asyncio.run(run())
+    assert [season.from_year for season in seasons] == list(range(2001, 2026))
+    assert sizes == [10, 10, 5]
@@ -0,0 +1,67 @@
+import asyncio
+from collections import Counter
+
+from entities.competition import get_competition_dict
+from scraping import _local_utils, async_scraper
+from scraping.async_scraper import AsyncFootballScraper
+
+BASE_URL = 'https://fbref.com'
+COMPETITIONS_URL = f'{BASE_URL}/en/comps/'
+COMPETITION_URL = f'{BASE_URL}/en/comps/9/history/'
+YEARS = range(2020, 2024)
+TEAM_SEASON_PAGE = (
+    '<a href="/en/squads/arsenal/history/">Arsenal Stats &amp; History</a>'
+)
+
+
+def _site() -> dict[str, str]:
+    season_rows = ''.join(
+        f'<tr><th><a href="/en/comps/9/{year}/">'
+        f'{year}-{year + 1}</a></th></tr>'
+        for year in YEARS
+    )
+    pages = {
+        COMPETITIONS_URL: '<a href="/en/comps/9/history/">Premier League</a>',
+        COMPETITION_URL: f'<table id="seasons">{season_rows}</table>',
+        f'{BASE_URL}/en/squads/arsenal/history/': (
+            '<div><div><img class="teamlogo" src="logo/arsenal"/></div>'
+            '<div><p><strong>Team Name:</strong> Arsenal</p></div></div>'
+        ),
+    }
+    for year in YEARS:
+        pages[f'{BASE_URL}/en/comps/9/{year}/'] = (
+            f'<table id="results{year}"><tr><td data-stat="team">'
+            f'<a href="/en/squads/arsenal/{year}/">Arsenal</a>'
+            '</td></tr></table>'
+        )
+        pages[f'{BASE_URL}/en/squads/arsenal/{year}/'] = TEAM_SEASON_PAGE
+    return pages
+
+
+def test_concurrent_seasons_fetch_each_page_once(monkeypatch):
+    pages = _site()
+    fetches = Counter()
+
+    def get_html(url: str) -> str:
+        fetches[url] += 1
+        return pages[url]
+
+    _local_utils.clear_page_cache()
+    _local_utils._find_url.cache_clear()
+    monkeypatch.setattr(_local_utils, '_get_html', get_html)
+    monkeypatch.setattr(
+        async_scraper, 'get_competitions_url', lambda: COMPETITIONS_URL
+    )
+    scraper = AsyncFootballScraper()
+
+    results = asyncio.run(
+        scraper.process_competition(
+            get_competition_dict()['premier_league'], YEARS[0], YEARS[-1]
+        )
+    )
+    _local_utils.clear_page_cache()
+    _local_utils._find_url.cache_clear()
+
+    assert [teams[0].name for teams in results.values()] == ['Arsenal'] * 4
+    assert set(fetches) == set(pages)
+    assert max(fetches.values()) == 1
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy.dialects import mysql, postgresql
+
+from database.dialects import dialect_insert
+from database.schemas import TeamModel
+
+NATURAL_KEY = ['name', 'country', 'gender']
+DIALECTS = {'mysql': mysql, 'postgresql': postgresql}
+
+
+def _compile(dialect_name: str, *, update: bool) -> str:
+    dialect = DIALECTS[dialect_name].dialect()
+    stmt = dialect_insert(
+        TeamModel.__table__, dialect_name, NATURAL_KEY, update=update
+    )
+    return str(stmt.compile(dialect=dialect))
+
+
+@pytest.mark.parametrize(
+    ('dialect_name', 'update', 'clause'),
+    [
+        ('mysql', False, 'ON DUPLICATE KEY UPDATE id = team.id'),
+        ('mysql', True, 'ON DUPLICATE KEY UPDATE type = VALUES(type)'),
+        ('postgresql', False, 'ON CONFLICT DO NOTHING'),
+        (
+            'postgresql',
+            True,
+            'ON CONFLICT (name, country, gender) DO UPDATE SET type = '
+            'excluded.type',
+        ),
+    ],
+)
+def test_dialect_insert_conflict_clause(dialect_name, update, clause):
+    assert clause in _compile(dialect_name, update=update)
+
+
+@pytest.mark.parametrize('dialect_name', ['mysql', 'postgresql'])
+def test_dialect_insert_never_updates_key_columns(dialect_name):
+    compiled = _compile(dialect_name, update=True)
+    update_clause = compiled.split('UPDATE', 1)[1]
+    assert 'logo_id' in update_clause
+    for column in ['id', *NATURAL_KEY]:
+        assert f' {column} =' not in update_clause
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from entities.team import Team
+
+
+def test_from_dataframe_converts_gaps_to_none():
+    df = pd.DataFrame(
+        {
+            'name': ['Arsenal', 'Chelsea'],
+            'gender': ['male', 'male'],
+            'country': ['england', 'england'],
+            'type': ['club', 'club'],
+            'year_founded': [1886, None],
+        }
+    )
+
+    teams = Team.from_dataframe(df)
+
+    assert [team.year_founded for team in teams] == [1886, None]
+    assert Team.to_records(teams, deep=False) == [
+        team.to_dict(deep=False) for team in teams
+    ]
@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from database.engine import Database
+from database.repository import FootballRepository
+from database.resource_management import SqlResourceManager
+from database.schemas import SeasonModel
+from entities.season import Season
+
+
+def test_in_memory_database_serialises_threads():
+    database = Database('sqlite://')
+    SqlResourceManager(database.connection).create_all_tables()
+    repository = FootballRepository(database.session)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        seasons = list(
+            executor.map(
+                lambda year: repository.add_season(Season(year)),
+                range(2001, 2401),
+            )
+        )
+
+    with database.session() as session:
+        stored_ids = session.scalars(select(SeasonModel.id)).all()
+    assert len({season.id for season in seasons}) == 400
+    assert sorted(stored_ids) == sorted(season.id for season in seasons)
@@ -0,0 +1,100 @@
+import pytest
+import requests
+from sqlalchemy import select
+
+from database.engine import Database
+from database.repository import FootballRepository
+from database.resource_management import SqlResourceManager
+from database.schemas import LogoModel, TeamModel
+from football_data_manager import FootballDataManager
+from ingest_manifest import IngestManifest
+from scraping import logos
+from scraping.scraper import FootballScraper, ScrapedTeam
+
+LOGO_URLS = {'Arsenal': 'logo/a', 'Chelsea': 'logo/c', 'Spurs': 'logo/a'}
+
+
+class StubScraper(FootballScraper):
+    def scrape_teams(self, competition_name, season) -> list[ScrapedTeam]:
+        return [
+            ScrapedTeam(f'team/{name}', name, logo_url)
+            for name, logo_url in LOGO_URLS.items()
+        ]
+
+
+class FailingRepository(FootballRepository):
+    def __init__(self, *args, failures: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.failures = failures
+
+    def get_or_create_teams(self, teams):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('Failed to store teams.')
+        return super().get_or_create_teams(teams)
+
+
+@pytest.fixture
+def database() -> Database:
+    database = Database('sqlite://')
+    SqlResourceManager(database.connection).create_all_tables()
+    return database
+
+
+def _team_logos(database: Database) -> dict[str, bytes]:
+    with database.session() as session:
+        return dict(
+            session.execute(
+                select(TeamModel.name, LogoModel.data).outerjoin(
+                    LogoModel, TeamModel.logo_id == LogoModel.id
+                )
+            ).all()
+        )
+
+
+def test_logos_survive_rolled_back_season(database, tmp_path, monkeypatch):
+    monkeypatch.setattr(logos, '_download', lambda url: url.encode())
+    data_manager = FootballDataManager(
+        StubScraper(),
+        FailingRepository(database.session, failures=1),
+        IngestManifest(tmp_path / 'manifest.json'),
+        refresh_current_season=False,
+    )
+
+    with pytest.raises(RuntimeError):
+        data_manager.process_competitions(['premier_league'], 2020, 2021)
+    data_manager.process_competitions(['premier_league'], 2020, 2021)
+
+    assert _team_logos(database) == {
+        'Arsenal': b'logo/a',
+        'Chelsea': b'logo/c',
+        'Spurs': b'logo/a',
+    }
+
+
+def test_failed_logo_download_is_retried(database, tmp_path, monkeypatch):
+    def download(url: str) -> bytes:
+        if url == 'logo/c' and not retried:
+            raise requests.ConnectionError(url)
+        return url.encode()
+
+    retried = False
+    monkeypatch.setattr(logos, '_download', download)
+    data_manager = FootballDataManager(
+        StubScraper(),
+        FootballRepository(database.session),
+        IngestManifest(tmp_path / 'manifest.json'),
+        refresh_current_season=False,
+    )
+
+    data_manager.process_competitions(['premier_league'], 2020, 2021)
+    assert _team_logos(database)['Chelsea'] is None
+
+    # Teams stored without a logo are given one when a later run finds it
+    retried = True
+    data_manager.process_competitions(['premier_league'], 2021, 2022)
+    assert _team_logos(database) == {
+        'Arsenal': b'logo/a',
+        'Chelsea': b'logo/c',
+        'Spurs': b'logo/a',
+    }
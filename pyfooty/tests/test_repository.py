@@ -0,0 +1,149 @@
+from typing import Optional
+
+import pytest
+from sqlalchemy import event, select
+
+from database.engine import Database
+from database.repository import FootballRepository
+from database.resource_management import ResetMode, SqlResourceManager
+from database.enums import Gender, TeamType
+from database.schemas import SeasonModel, TeamModel
+from entities.season import Season
+from entities.team import Team
+
+
+@pytest.fixture
+def database() -> Database:
+    database = Database('sqlite://')
+    SqlResourceManager(database.connection).create_all_tables()
+    return database
+
+
+@pytest.fixture
+def repository(database) -> FootballRepository:
+    return FootballRepository(database.session)
+
+
+def _team(name: str, year_founded: Optional[int] = None) -> Team:
+    return Team(
+        name=name,
+        gender=Gender.MALE,
+        country='england',
+        type=TeamType.CLUB,
+        year_founded=year_founded,
+    )
+
+
+def _record_statements(database: Database) -> list[str]:
+    statements = []
+    with database.session() as session:
+        event.listen(
+            session.get_bind(),
+            'before_cursor_execute',
+            lambda *args: statements.append(args[2]),
+        )
+    return statements
+
+
+def test_get_or_create_many_writes_duplicate_keys_once(database, repository):
+    seasons = repository.get_or_create_seasons(
+        [Season(2020), Season(2021), Season(2020)]
+    )
+
+    with database.session() as session:
+        stored = session.scalars(select(SeasonModel)).all()
+    assert len(stored) == 2
+    assert seasons[0].id == seasons[2].id != seasons[1].id
+
+
+def test_get_or_create_many_keeps_existing_rows(repository):
+    existing = repository.get_or_create_teams([_team('Arsenal', 1886)])
+    repository.invalidate_cache()
+
+    teams = repository.get_or_create_teams(
+        [_team('Arsenal', 1900), _team('Chelsea', 1905)]
+    )
+
+    assert teams[0] == existing[0]
+    assert teams[1].year_founded == 1905
+
+
+def test_upsert_many_updates_non_key_columns(database, repository):
+    created = repository.upsert_many(
+        [_team('Arsenal', 1886), _team('Chelsea')],
+        TeamModel,
+        ['name', 'country', 'gender'],
+    )
+    updated = repository.upsert_many(
+        [_team('Arsenal', 1887), _team('Chelsea', 1905)],
+        TeamModel,
+        ['name', 'country', 'gender'],
+    )
+
+    with database.session() as session:
+        stored = {
+            team.name: team.year_founded
+            for team in session.scalars(select(TeamModel))
+        }
+    assert stored == {'Arsenal': 1887, 'Chelsea': 1905}
+    assert [team.id for team in updated] == [team.id for team in created]
+    assert [team.year_founded for team in updated] == [1887, 1905]
+
+
+def test_get_or_create_many_statements_per_batch(database, repository):
+    statements = _record_statements(database)
+
+    repository.get_or_create_seasons(Season(year) for year in range(2001, 2051))
+    # Selecting the missing keys, inserting them and selecting their ids
+    assert len(statements) == 3
+
+    statements.clear()
+    repository.get_or_create_seasons(Season(year) for year in range(2001, 2051))
+    # Every season is now held in the identity map
+    assert statements == []
+
+
+def test_streams_page_by_primary_key_without_server_side_cursors(
+    database, repository
+):
+    # pysqlite has no server side cursors, so streams are paged by key
+    with database.session() as session:
+        assert not session.get_bind().dialect.supports_server_side_cursors
+    repository.add_many(
+        [Season(year) for year in range(2001, 2026)], SeasonModel
+    )
+
+    seasons = list(repository.stream_entities(SeasonModel, chunk_size=10))
+    dataframes = list(repository.stream_dataframes(SeasonModel, chunk_size=10))
+
+    assert [season.from_year for season in seasons] == list(range(2001, 2026))
+    assert [len(dataframe) for dataframe in dataframes] == [10, 10, 5]
+    assert list(dataframes[-1]['from_year']) == list(range(2021, 2026))
+
+
+@pytest.mark.parametrize('mode', list(ResetMode))
+def test_reset_invalidates_cached_entities(database, repository, mode):
+    resource_manager = SqlResourceManager(
+        database.connection, identity_map=repository.identity_map
+    )
+    repository.get_or_create_season(Season(2020))
+
+    resource_manager.reset(mode)
+    season = repository.get_or_create_season(Season(2020))
+
+    with database.session() as session:
+        stored_ids = session.scalars(select(SeasonModel.id)).all()
+    assert stored_ids == [season.id]
+
+
+def test_bulk_load_invalidates_cached_entities(database, repository):
+    resource_manager = SqlResourceManager(
+        database.connection, identity_map=repository.identity_map
+    )
+    repository.get_or_create_season(Season(2020))
+
+    resource_manager.bulk_load(
+        SeasonModel, [{'from_year': 2021, 'to_year': 2022}]
+    )
+
+    assert repository.identity_map.get(SeasonModel, (2020,)) is None
@@ -0,0 +1,10 @@
+from entities.season import Season
+
+
+def test_seasons_are_slotted():
+    assert not hasattr(Season(2020), '__dict__')
+
+
+def test_interned_seasons_are_shared():
+    assert Season.interned(2020) is Season.interned(2020)
+    assert Season.interned(2020) == Season(2020)